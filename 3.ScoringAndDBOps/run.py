@@ -148,6 +148,13 @@ log_line(
 )
 log_line(separator)
 
+# IDs committed to the DB in this run, written to inserted_this_run.json for
+# 4.RetryFailures so it can tell which retried diamonds still failed.
+inserted_ids_path = os.path.join(os.path.dirname(__file__), "inserted_this_run.json")
+if os.path.exists(inserted_ids_path):
+    os.remove(inserted_ids_path)
+inserted_ids = []
+
 # Create a single DB connection for this scoring run
 conn = None
 try:
@@ -329,6 +336,7 @@ for idx, diamond in enumerate(openai_response, start=1):
                     # 5) Mark product info as digitized and attach FKs
                     update_product_info(conn, str(diamond_id), digi_id, score_id)
                     conn.commit()
+                    inserted_ids.append(str(diamond_id))
                 except Exception as db_exc:
                     # Log but continue processing other diamonds
                     logger.exception("DB error for diamond_id=%s", diamond_id)
@@ -343,6 +351,18 @@ for idx, diamond in enumerate(openai_response, start=1):
         log_line(f"❌ Error processing {s_name}: {e}")
         log_line(tb)
 
+try:
+    # The retry step trusts this file, so write it to a temp sibling and move it into place
+    tmp_inserted_path = inserted_ids_path + ".tmp"
+    with open(tmp_inserted_path, "w", encoding="utf-8") as out_f:
+        json.dump(inserted_ids, out_f, indent=2)
+        out_f.flush()
+        os.fsync(out_f.fileno())
+    os.replace(tmp_inserted_path, inserted_ids_path)
+    logger.info("Wrote %d inserted diamond_ids to %s", len(inserted_ids), inserted_ids_path)
+except Exception:
+    logger.exception("Failed to write inserted_this_run.json")
+
 if conn is not None:
     try:
         logger.info("Closing database connection.")
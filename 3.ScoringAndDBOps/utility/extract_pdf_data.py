@@ -2,6 +2,7 @@ import decimal
 import json
 import logging
 import re
+from functools import lru_cache
 from itertools import takewhile
 from pathlib import Path
 from typing import TypedDict, Optional
@@ -13,6 +14,58 @@ import requests
 
 
 pattern_digi = r'\d+[,.]?\d+'
+_DIGI_RE = re.compile(pattern_digi)
+_MEA_SEP = re.compile(r'[*xX]')
+_FLOAT_RE = re.compile(r'[+-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?')
+
+# Written into pdf_dc for values that could not be determined, and the
+# placeholder grade passed to the scorers when a value is missing.
+_ND = 'ND'
+_NONE_TAG = 'None'
+_NOT_APPLICABLE = 'Not Applicable'
+_UNSET = frozenset((_ND, None))
+_GIRDLE_UNSET = _UNSET | {'none', 'false', 'None'}
+
+_NULLISH = frozenset((None, '', 'false', 'False', 'none', 'None', 'null', 'Null'))
+# "None" is a real culet/fluorescence grade, so those fields only skip the falsy sentinels.
+_NULLISH_KEEP_NONE = _NULLISH - {'none', 'None'}
+_NULLISH_PAVILION = _NULLISH | {'0.0000'}
+# Table/depth values that score as 0 without being parsed.
+_ZERO_SENTINELS = frozenset(('0', _ND, _NOT_APPLICABLE))
+
+_MISSING = frozenset((None,))
+# Numeric fields that are present in pdf_dc but hold no measurement; the
+# affiliate fallback has always been checked against a slightly shorter list.
+_PAVILION_INVALID = frozenset((None, 'false', '', _ND, _NOT_APPLICABLE, '1'))
+_PAVILION_AFF_INVALID = frozenset((None, 'false', '', '1'))
+_CROWN_INVALID = frozenset((None, '', 'false', 'none', _ND, _NOT_APPLICABLE, '1'))
+_CROWN_AFF_INVALID = frozenset((None, '', 'false', 'none', _ND, '1'))
+
+_GRADE_FIELDS = ('polish', 'symmetry', 'cut')
+
+# (affiliate key, pdf_dc key, values that must not overwrite the pdf value)
+_AFFILIATE_COPY = (
+    ('shape', 'shape', _NULLISH_KEEP_NONE),
+    ('carat', 'carat', _NULLISH),
+    ('table_size', 'table_size', _NULLISH),
+    ('griddle', 'girdle', _NULLISH),
+    ('depth', 'depth', _NULLISH),
+    ('measurement', 'measurement', _NULLISH),
+    ('culet', 'culet', _NULLISH_KEEP_NONE),
+    ('color', 'color_grade', _NULLISH),
+    ('polish', 'polish', _NULLISH),
+    ('symmetry', 'symmetry', _NULLISH),
+    ('fluorescence', 'fluorescence', _NULLISH_KEEP_NONE),
+    ('cut', 'cut', _NULLISH),
+)
+_AFFILIATE_COPY_ROUND = _AFFILIATE_COPY + (
+    ('pavilion_height', 'pavilion_height', _NULLISH_PAVILION),
+    ('pavilion_angle', 'pavilion_angle', _NULLISH_PAVILION),
+    ('crown_height', 'crown_height', _NULLISH),
+    ('crown_angle', 'crown_angle', _NULLISH),
+)
+
+_check_cache = {}
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +74,134 @@ def take_second(tup):
     return tup[0][0][0][1]
 
 
+def _safe_float(value):
+    if isinstance(value, (int, float, decimal.Decimal)):
+        return float(value)
+    if isinstance(value, str) and _FLOAT_RE.fullmatch(value.strip()):
+        return float(value)
+    return None
+
+
+def _to_float(value):
+    return float(value if ',' not in value else value.replace(',', '.'))
+
+
+def _characteristic_info(characteristic_json, name):
+    if characteristic_json is characteristic_data:
+        return _CHAR.get(name)
+    for data in characteristic_json:
+        if data['characteristic_name'] == name:
+            return data['characteristic_data']
+    return None
+
+
+def _parse_carat(value):
+    # "1.01 carat" -> 1.01, anything that does not start with a plain number is passed through as is
+    if isinstance(value, str):
+        head = value.split(' ', 1)[0]
+        if _FLOAT_RE.fullmatch(head):
+            return float(head)
+    return value
+
+
+def _clean_girdle(value):
+    # "Medium to Thick (Faceted) 3.5%" -> "Medium to Thick"; single words and blanks are kept as is
+    parts = value.split()
+    if len(parts) < 2:
+        return value
+    if "(" in parts[-2]:
+        del parts[-2]
+    if "%" in parts[-1]:
+        del parts[-1]
+    return ' '.join(parts)
+
+
+@lru_cache(maxsize=4096)
+def _parse_digi(value):
+    # The same table/depth/angle strings ("59.5%") recur across diamonds.
+    return _to_float(_DIGI_RE.findall(value)[0])
+
+
+def _resolve(pdf_dc, aff, key, nullish=_NULLISH):
+    # pdf value, else affiliate value, else mark as ND and return None
+    value = pdf_dc.get(key)
+    if value is None and aff is not None and aff.get(key) not in nullish:
+        value = pdf_dc[key] = aff[key]
+    if value is None:
+        pdf_dc[key] = _ND
+    return value
+
+
+def _resolve_number(pdf_dc, aff, key, invalid, aff_invalid, zero=frozenset()):
+    # Same fallback as _resolve, then parse the number (values in `zero` count as 0)
+    value = pdf_dc.get(key)
+    if value in invalid:
+        value = aff.get(key) if aff is not None else None
+        if value in aff_invalid:
+            pdf_dc[key] = _ND
+            return None
+        pdf_dc[key] = value
+    if value in zero:
+        return 0
+    return _parse_digi(value)
+
+
+def _casefold_index(entries):
+    # {"name": ..., "value": ...} entries keyed by casefolded name, first entry wins
+    index = {}
+    for entry in entries:
+        index.setdefault(entry['name'].casefold(), entry['value'])
+    return index
+
+
+def _culet_index(info):
+    # (lowercased shape, casefolded culet index) per culet section entry
+    return tuple((d["shape"].lower(), _casefold_index(d["value"])) for d in info)
+
+
+def _band_table(info):
+    # info maps "lo-hi" (or a single "x") to a score, as in pavillion_angle / round_crown
+    keys = tuple(info)
+    bounds = [key.split('-') for key in keys]
+    lows = tuple(float(b[0]) for b in bounds)
+    highs = tuple(float(b[1]) if len(b) == 2 else float(b[0]) for b in bounds)
+    return keys, lows, highs
+
+
+def _band_score(characteristic_json, name, value):
+    # Score of the first band containing value, 0 if none
+    info = _characteristic_info(characteristic_json, name)
+    keys, lows, highs = _BANDS[name] if characteristic_json is characteristic_data else _band_table(info)
+    for key, low, high in zip(keys, lows, highs):
+        if low <= value <= high:
+            return info[key]
+    return 0
+
+
+def _cached_check(check, *args, **kwargs):
+    # The grade checks are pure lookups into characteristic_data, so memoize them on their arguments
+    key = (check, args, tuple(kwargs.items()))
+    try:
+        return _check_cache[key]
+    except KeyError:
+        result = check(*args, characteristic_json=characteristic_data, **kwargs)
+        if len(_check_cache) < 4096:
+            _check_cache[key] = result
+        return result
+    except TypeError:
+        # unhashable value, leave it to the check itself
+        return check(*args, characteristic_json=characteristic_data, **kwargs)
+
+
+def _merge_affiliate(pdf_dc, aff, fields=_AFFILIATE_COPY):
+    if aff is None:
+        return
+    for src, dst, nullish in fields:
+        value = aff.get(src)
+        if value not in nullish:
+            pdf_dc[dst] = value
+
+
 _BASE_DIR = Path(__file__).parent
 _DIAMONDS_CONFIG_PATH = _BASE_DIR / "diamonds_type_config.json"
 _CHAR_CONFIG_PATH = _BASE_DIR / "config.json"
@@ -33,6 +214,9 @@ with _DIAMONDS_CONFIG_PATH.open("r", encoding="utf-8") as fs:
         _DIAMONDS_CONFIG_PATH,
     )
 
+# reversed() so the first entry for a type wins, as with the old filter() scan
+_DIAMOND_BY_TYPE = {diamond_dict["Diamond_type"]: diamond_dict for diamond_dict in reversed(data)}
+
 with _CHAR_CONFIG_PATH.open("r", encoding="utf-8") as f:
     characteristic_data = json.load(f)
     logger.info(
@@ -41,6 +225,14 @@ with _CHAR_CONFIG_PATH.open("r", encoding="utf-8") as f:
         _CHAR_CONFIG_PATH,
     )
 
+# characteristic_data is fixed for the run, so index its sections by name once
+_CHAR = {d['characteristic_name']: d['characteristic_data'] for d in reversed(characteristic_data)}
+_BANDS = {name: _band_table(_CHAR[name]) for name in ('pavillion_angle', 'round_crown') if name in _CHAR}
+_GIRDLE_VALUES = {
+    name: _casefold_index(_CHAR[name]) for name in ('GIRDLE THICKNESS', 'GIRDLE THICKNESS HEART') if name in _CHAR
+}
+_CULET_VALUES = _culet_index(_CHAR['culet']) if 'culet' in _CHAR else ()
+
 
 
 def fetch_data_from_gia(text, refine_dic, round_fg):
@@ -149,11 +341,7 @@ def check_fluorescence(flour_value, characteristic_json, Color_Grade):
             data_f = 'default'
         else:
             data_f = flour_value
-    info = None
-    for data in characteristic_json:
-        if data['characteristic_name'] == "FLUORESCENCE":
-            info = data['characteristic_data']
-            break
+    info = _characteristic_info(characteristic_json, "FLUORESCENCE")
     for f in info:
         if Color_Grade.rstrip() == f['data_type']:
             very_strong_value = next(
@@ -165,11 +353,7 @@ def check_fluorescence(flour_value, characteristic_json, Color_Grade):
 
 
 def check_girdle(threshold, value, characteristic_json):
-    info = None
-    for data in characteristic_json:
-        if data['characteristic_name'] == "GIRDLE THICKNESS":
-            info = data['characteristic_data']
-            break
+    info = _characteristic_info(characteristic_json, "GIRDLE THICKNESS")
     if value in threshold and threshold is not 'None':
         for i in info:
             if i['name'].lower() == value.lower():
@@ -184,11 +368,7 @@ def check_girdle(threshold, value, characteristic_json):
 
 
 def check_polish(threshold="None", value=None, characteristic_json=None):
-    info = None
-    for data in characteristic_json:
-        if data['characteristic_name'] == "ROUND SCORE":
-            info = data['characteristic_data']
-            break
+    info = _characteristic_info(characteristic_json, "ROUND SCORE")
     if value.lower() in threshold and threshold != 'None':
         for i in info:
             if i['data_type'].lower().strip() == value.lower().strip():
@@ -205,11 +385,7 @@ def check_polish(threshold="None", value=None, characteristic_json=None):
 
 
 def check_symmetry(threshold, value, characteristic_json):
-    info = None
-    for data in characteristic_json:
-        if data['characteristic_name'] == "ROUND SCORE":
-            info = data['characteristic_data']
-            break
+    info = _characteristic_info(characteristic_json, "ROUND SCORE")
     if value.lower() in threshold and threshold != 'None':
         for i in info:
             if i['data_type'].lower() == value.lower():
@@ -238,11 +414,7 @@ def check_symbol(data_type_to_fetch, data_con):
             # if
             data_ls = data_type_to_fetch.split()
 
-    info = None
-    for data in data_con:
-        if data['characteristic_name'] == "KEYS TO SYMBOLS":
-            info = data['characteristic_data']
-            break
+    info = _characteristic_info(data_con, "KEYS TO SYMBOLS")
     if len(data_ls) == 1:
         data_type_to_fetch = data_type_to_fetch.upper()
         if data_type_to_fetch == "TWINNINGWISP":
@@ -321,69 +493,10 @@ def fetch_data(req_dc, pdf_dc, affiliate_process_data, shape=None):
         bool(affiliate_process_data),
     )
     pdf_dc_new = pdf_dc.copy()
+    aff = affiliate_process_data or None
+    has_aff = aff is not None
     # print("affiliate_process_data::", affiliate_process_data)
-    if affiliate_process_data is not None and affiliate_process_data:
-        if affiliate_process_data["shape"] is not None and affiliate_process_data["shape"] != '' and \
-                affiliate_process_data["shape"] != 'null' and affiliate_process_data["shape"] != 'Null' and \
-                affiliate_process_data["shape"] != 'False' and affiliate_process_data["shape"] != 'false':
-            pdf_dc['shape'] = affiliate_process_data["shape"]
-        if affiliate_process_data["carat"] is not None and affiliate_process_data["carat"] != 'false' and \
-                affiliate_process_data["carat"] != '' and affiliate_process_data["carat"] != 'none' and \
-                affiliate_process_data["carat"] != 'None' and affiliate_process_data["carat"] != 'null' and \
-                affiliate_process_data["carat"] != 'Null':
-            pdf_dc['carat'] = affiliate_process_data["carat"]
-        if affiliate_process_data["table_size"] is not None and affiliate_process_data["table_size"] != 'Null' and \
-                affiliate_process_data["table_size"] != 'none' and affiliate_process_data["table_size"] != '' and \
-                affiliate_process_data["table_size"] != 'None' and affiliate_process_data["table_size"] != 'false' and \
-                affiliate_process_data["table_size"] != 'False':
-            pdf_dc['table_size'] = affiliate_process_data["table_size"]
-        if affiliate_process_data["griddle"] is not None and affiliate_process_data["griddle"] != 'false' and \
-                affiliate_process_data["griddle"] != 'False' and affiliate_process_data["griddle"] != '' and \
-                affiliate_process_data["griddle"] != 'none' and affiliate_process_data["griddle"] != 'None' and \
-                affiliate_process_data["griddle"] != 'null' and affiliate_process_data["griddle"] != 'Null':
-            pdf_dc['girdle'] = affiliate_process_data["griddle"]
-        if affiliate_process_data["depth"] is not None and affiliate_process_data["depth"] != 'null' and \
-                affiliate_process_data["depth"] != 'Null' and affiliate_process_data[
-            "depth"] != 'false' and affiliate_process_data["depth"] != 'False' and affiliate_process_data[
-            "depth"] != 'none' and affiliate_process_data["depth"] != 'None' and affiliate_process_data["depth"] != '':
-            pdf_dc['depth'] = affiliate_process_data["depth"]
-        if affiliate_process_data["measurement"] is not None and affiliate_process_data["measurement"] != 'False' and \
-                affiliate_process_data["measurement"] != 'false' and affiliate_process_data["measurement"] != '' and \
-                affiliate_process_data["measurement"] != 'null' and affiliate_process_data["measurement"] != 'Null' and \
-                affiliate_process_data["measurement"] != 'none' and affiliate_process_data["measurement"] != 'None':
-            pdf_dc['measurement'] = affiliate_process_data["measurement"]
-        if affiliate_process_data["culet"] is not None and affiliate_process_data["culet"] != '' and \
-                affiliate_process_data["culet"] != 'false' and affiliate_process_data["culet"] != 'False' and \
-                affiliate_process_data["culet"] != 'null' and affiliate_process_data["culet"] != 'Null':
-            pdf_dc['culet'] = affiliate_process_data["culet"]
-
-        if affiliate_process_data["color"] is not None and affiliate_process_data["color"] != 'none' and \
-                affiliate_process_data["color"] != 'None' and affiliate_process_data["color"] != '' and \
-                affiliate_process_data["color"] != 'False' and affiliate_process_data["color"] != 'false' and \
-                affiliate_process_data["color"] != 'null' and affiliate_process_data["color"] != 'Null':
-            pdf_dc['color_grade'] = affiliate_process_data["color"]
-
-        if affiliate_process_data["polish"] is not None and affiliate_process_data["polish"] != 'false' and \
-                affiliate_process_data["polish"] != 'False' and affiliate_process_data["polish"] != '' and \
-                affiliate_process_data["polish"] != 'None' and affiliate_process_data["polish"] != 'none' and \
-                affiliate_process_data["polish"] != 'null' and affiliate_process_data["polish"] != 'Null':
-            pdf_dc['polish'] = affiliate_process_data["polish"]
-
-        if affiliate_process_data["symmetry"] is not None and affiliate_process_data["symmetry"] != '' and \
-                affiliate_process_data["symmetry"] != 'false' and affiliate_process_data["symmetry"] != 'False' and \
-                affiliate_process_data["symmetry"] != 'none' and affiliate_process_data["symmetry"] != 'None' and \
-                affiliate_process_data["symmetry"] != 'null' and affiliate_process_data["symmetry"] != 'Null':
-            pdf_dc['symmetry'] = affiliate_process_data["symmetry"]
-        if affiliate_process_data["fluorescence"] is not None and affiliate_process_data["fluorescence"] != '' and \
-                affiliate_process_data["fluorescence"] != 'False' and affiliate_process_data[
-            "fluorescence"] != 'false' and affiliate_process_data["fluorescence"] != 'null' and affiliate_process_data[
-            "fluorescence"] != 'Null':
-            pdf_dc['fluorescence'] = affiliate_process_data["fluorescence"]
-        if affiliate_process_data["cut"] is not None and affiliate_process_data["cut"] != '' and affiliate_process_data[
-            "cut"] != 'none' and affiliate_process_data["cut"] != 'None' and affiliate_process_data[
-            "cut"] != 'false' and affiliate_process_data["cut"] != 'False' and affiliate_process_data[
-            "cut"] != 'null' and affiliate_process_data["cut"] != 'Null':
-            pdf_dc['cut'] = affiliate_process_data["cut"]
+    _merge_affiliate(pdf_dc, aff)
 
     type = None
     if "shape" in pdf_dc:
@@ -422,9 +535,9 @@ def fetch_data(req_dc, pdf_dc, affiliate_process_data, shape=None):
 
 
         else:
-            if affiliate_process_data is not None and affiliate_process_data:
-                if affiliate_process_data["shape"] is not None:
-                    pdf_dc['shape'] = affiliate_process_data["shape"]
+            if has_aff:
+                if aff["shape"] is not None:
+                    pdf_dc['shape'] = aff["shape"]
                     if "shape" in pdf_dc:
                         if "shape" in pdf_dc:
                             type = pdf_dc['shape'].split()
@@ -460,12 +573,13 @@ def fetch_data(req_dc, pdf_dc, affiliate_process_data, shape=None):
 
 
                         else:
-                            pdf_dc['shape'] = "ND"
+                            pdf_dc['shape'] = _ND
 
-            pdf_dc['shape'] = "ND"
+            pdf_dc['shape'] = _ND
         if 'round' in pdf_dc['shape'].lower():
             return fetch_data_round(req_dc, pdf_dc, affiliate_process_data, shape=None)
 
+        lw_ratio = _ND
         if pdf_dc["measurement"] is not None:
             # measurements = pdf_dc['measurement'].replace("*", "x")
             measurements = pdf_dc['measurement'].replace(",", ".").replace("*", "x").lower().split('x')
@@ -479,8 +593,8 @@ def fetch_data(req_dc, pdf_dc, affiliate_process_data, shape=None):
                     lw_ratio = float(measurements_sp[0]) / float(measurements_sp[1])
                 except:
                     # measurements_sp = measurements[0].split()
-                    pdf_dc['measurement'] = 'ND'
-                    lw_ratio = 'ND'
+                    pdf_dc['measurement'] = _ND
+                    lw_ratio = _ND
 
             # Converting the above number into decimal
             try:
@@ -488,23 +602,16 @@ def fetch_data(req_dc, pdf_dc, affiliate_process_data, shape=None):
                 # rounding off
                 lw_ratio = decimal_value.quantize(decimal.Decimal('0.00'))
             except:
-                if affiliate_process_data is not None and affiliate_process_data:
-
-                    if affiliate_process_data["measurement"] is not None and affiliate_process_data[
-                        "measurement"] != 'False' and \
-                            affiliate_process_data["measurement"] != 'false' and affiliate_process_data[
-                        "measurement"] != '' and \
-                            affiliate_process_data["measurement"] != 'null' and affiliate_process_data[
-                        "measurement"] != 'Null' and \
-                            affiliate_process_data["measurement"] != 'none' and affiliate_process_data[
-                        "measurement"] != 'None':
-                        pdf_dc['measurement'] = affiliate_process_data["measurement"]
+                if has_aff:
+
+                    if aff.get("measurement") not in _NULLISH:
+                        pdf_dc['measurement'] = aff["measurement"]
                         # measurements = pdf_dc['measurement'].replace("*", "x")
-                        measurements = affiliate_process_data['measurement'].replace(",", ".").replace("*",
+                        measurements = aff['measurement'].replace(",", ".").replace("*",
                                                                                                        "x").lower().split(
                             'x')
                         if len(measurements) == 1:
-                            measurements = affiliate_process_data['measurement'].split('X')
+                            measurements = aff['measurement'].split('X')
                         try:
                             lw_ratio = float(measurements[0]) / float(measurements[1])
                         except:
@@ -512,36 +619,29 @@ def fetch_data(req_dc, pdf_dc, affiliate_process_data, shape=None):
                                 measurements_sp = measurements[0].split()
                                 lw_ratio = float(measurements_sp[0]) / float(measurements_sp[1])
                             except:
-                                pdf_dc['measurement'] = 'ND'
-                                lw_ratio = 'ND'
+                                pdf_dc['measurement'] = _ND
+                                lw_ratio = _ND
                         try:
                             decimal_value = decimal.Decimal(lw_ratio)
                             # rounding off
                             lw_ratio = decimal_value.quantize(decimal.Decimal('0.00'))
                         except:
-                            pdf_dc['measurement'] = "ND"
+                            pdf_dc['measurement'] = _ND
 
                     else:
-                        pdf_dc['measurement'] = "ND"
+                        pdf_dc['measurement'] = _ND
                 else:
-                    pdf_dc['measurement'] = "ND"
+                    pdf_dc['measurement'] = _ND
         else:
-            if affiliate_process_data is not None and affiliate_process_data:
-                if affiliate_process_data["measurement"] is not None and affiliate_process_data[
-                    "measurement"] != 'False' and \
-                        affiliate_process_data["measurement"] != 'false' and affiliate_process_data[
-                    "measurement"] != '' and \
-                        affiliate_process_data["measurement"] != 'null' and affiliate_process_data[
-                    "measurement"] != 'Null' and \
-                        affiliate_process_data["measurement"] != 'none' and affiliate_process_data[
-                    "measurement"] != 'None':
-                    pdf_dc['measurement'] = affiliate_process_data["measurement"]
+            if has_aff:
+                if aff.get("measurement") not in _NULLISH:
+                    pdf_dc['measurement'] = aff["measurement"]
                     # measurements = pdf_dc['measurement'].replace("*", "x")
-                    measurements = affiliate_process_data['measurement'].replace(",", ".").replace("*",
+                    measurements = aff['measurement'].replace(",", ".").replace("*",
                                                                                                    "x").lower().split(
                         'x')
                     if len(measurements) == 1:
-                        measurements = affiliate_process_data['measurement'].split('X')
+                        measurements = aff['measurement'].split('X')
                     try:
                         lw_ratio = float(measurements[0]) / float(measurements[1])
                     except:
@@ -549,20 +649,21 @@ def fetch_data(req_dc, pdf_dc, affiliate_process_data, shape=None):
                             measurements_sp = measurements[0].split()
                             lw_ratio = float(measurements_sp[0]) / float(measurements_sp[1])
                         except:
-                            pdf_dc['measurement'] = 'ND'
-                            lw_ratio = 'ND'
+                            pdf_dc['measurement'] = _ND
+                            lw_ratio = _ND
                     try:
                         decimal_value = decimal.Decimal(lw_ratio)
                         # rounding off
                         lw_ratio = decimal_value.quantize(decimal.Decimal('0.00'))
                     except:
-                        pdf_dc['measurement'] = "ND"
+                        pdf_dc['measurement'] = _ND
                 else:
-                    pdf_dc['measurement'] = "ND"
+                    pdf_dc['measurement'] = _ND
             else:
-                pdf_dc['measurement'] = "ND"
+                pdf_dc['measurement'] = _ND
 
         final_dict = {}
+        ratio = None
         # shape = type[0].lower()
         if shape is None and "not" not in pdf_dc['shape']:
             req_dict = next(filter(lambda diamond_dict: diamond_dict["Diamond_type"] == type[0].lower(), req_dc), None)
@@ -583,197 +684,150 @@ def fetch_data(req_dc, pdf_dc, affiliate_process_data, shape=None):
         if pdf_dc['girdle'] is not None:
             girdle_gia = pdf_dc['girdle']
         else:
-            if affiliate_process_data is not None and affiliate_process_data:
-                if affiliate_process_data["griddle"] is not None and affiliate_process_data["griddle"] != 'false' and \
-                        affiliate_process_data["griddle"] != 'False' and affiliate_process_data["griddle"] != '' and \
-                        affiliate_process_data["griddle"] != 'none' and affiliate_process_data["griddle"] != 'None' and \
-                        affiliate_process_data["griddle"] != 'null' and affiliate_process_data["griddle"] != 'Null':
-                    pdf_dc['girdle'] = affiliate_process_data['griddle']
+            if has_aff:
+                if aff.get("griddle") not in _NULLISH:
+                    pdf_dc['girdle'] = aff['griddle']
                     girdle_gia = pdf_dc['girdle']
                 else:
-                    pdf_dc['girdle'] = "ND"
-                    girdle_gia = 'None'
+                    pdf_dc['girdle'] = _ND
+                    girdle_gia = _NONE_TAG
             else:
-                pdf_dc['girdle'] = "ND"
-                girdle_gia = 'None'
+                pdf_dc['girdle'] = _ND
+                girdle_gia = _NONE_TAG
 
         if pdf_dc['polish'] is not None:
             polish_value = pdf_dc['polish'].lower()
             # thres_polish = req_dict['polish']
 
         else:
-            if affiliate_process_data is not None and affiliate_process_data:
-                if affiliate_process_data["polish"] is not None and affiliate_process_data["polish"] != 'false' and \
-                        affiliate_process_data["polish"] != 'False' and affiliate_process_data["polish"] != '' and \
-                        affiliate_process_data["polish"] != 'None' and affiliate_process_data["polish"] != 'none' and \
-                        affiliate_process_data["polish"] != 'null' and affiliate_process_data["polish"] != 'Null':
-                    pdf_dc['polish'] = affiliate_process_data['polish']
+            if has_aff:
+                if aff.get("polish") not in _NULLISH:
+                    pdf_dc['polish'] = aff['polish']
                     # polish_value = pdf_dc['polish'].lower()
-                    polish_value = affiliate_process_data['polish'].lower()
+                    polish_value = aff['polish'].lower()
                 else:
-                    polish_value = 'None'
-                    pdf_dc['polish'] = "ND"
+                    polish_value = _NONE_TAG
+                    pdf_dc['polish'] = _ND
 
             else:
-                polish_value = 'None'
-                pdf_dc['polish'] = "ND"
+                polish_value = _NONE_TAG
+                pdf_dc['polish'] = _ND
         # thres_polish = req_dict['polish']
         if pdf_dc['symmetry'] is not None:
             symmetry_value = pdf_dc['symmetry']
         else:
             # thres_symmetry = req_dict['symmetry']
-            if affiliate_process_data is not None and affiliate_process_data:
-                if affiliate_process_data["symmetry"] is not None and affiliate_process_data["symmetry"] != '' and \
-                        affiliate_process_data["symmetry"] != 'false' and affiliate_process_data[
-                    "symmetry"] != 'False' and \
-                        affiliate_process_data["symmetry"] != 'none' and affiliate_process_data[
-                    "symmetry"] != 'None' and \
-                        affiliate_process_data["symmetry"] != 'null' and affiliate_process_data["symmetry"] != 'Null':
-                    pdf_dc['symmetry'] = affiliate_process_data['symmetry']
-                    symmetry_value = affiliate_process_data['symmetry']
+            if has_aff:
+                if aff.get("symmetry") not in _NULLISH:
+                    pdf_dc['symmetry'] = aff['symmetry']
+                    symmetry_value = aff['symmetry']
                 else:
-                    symmetry_value = 'None'
-                    pdf_dc['symmetry'] = "ND"
+                    symmetry_value = _NONE_TAG
+                    pdf_dc['symmetry'] = _ND
             else:
-                symmetry_value = 'None'
-                pdf_dc['symmetry'] = "ND"
+                symmetry_value = _NONE_TAG
+                pdf_dc['symmetry'] = _ND
 
         # thres_symmetry = req_dict['symmetry']
         # cut_grade_value = pdf_dc["cut_grade"]
         if pdf_dc['carat'] is None:
-            if affiliate_process_data is not None and affiliate_process_data:
-                if affiliate_process_data['carat'] is not None:
-                    pdf_dc['carat'] = affiliate_process_data['carat']
+            if has_aff:
+                if aff['carat'] is not None:
+                    pdf_dc['carat'] = aff['carat']
 
-        if 'culet' in pdf_dc and pdf_dc['culet'] is not None:
+        if pdf_dc.get('culet') is not None:
             culet_point = check_culet(type[0], pdf_dc["culet"], characteristic_data)
             final_dict['culet_score'] = culet_point
         else:
-            if affiliate_process_data is not None and affiliate_process_data:
-                if affiliate_process_data["culet"] is not None and affiliate_process_data["culet"] != '' and \
-                        affiliate_process_data["culet"] != 'false' and affiliate_process_data["culet"] != 'False' and \
-                        affiliate_process_data["culet"] != 'null' and affiliate_process_data["culet"] != 'Null':
-                    pdf_dc['culet'] = affiliate_process_data["culet"]
-                    culet_point = check_culet(type[0], affiliate_process_data["culet"], characteristic_data)
+            if has_aff:
+                if aff.get("culet") not in _NULLISH_KEEP_NONE:
+                    pdf_dc['culet'] = aff["culet"]
+                    culet_point = check_culet(type[0], aff["culet"], characteristic_data)
                     final_dict['culet_score'] = culet_point
                 else:
-                    pdf_dc['culet'] = "ND"
+                    pdf_dc['culet'] = _ND
                     final_dict['culet_score'] = 0
             else:
-                pdf_dc['culet'] = "ND"
+                pdf_dc['culet'] = _ND
                 final_dict['culet_score'] = 0
         # if "measurement" not in pdf_dc["measurement"] or pdf_dc["measurement"] == "ND":
         #     final_dict['length_width_ratio_score'] = 0
-        try:
-            if ratio is not None:
-
-                if float(lw_ratio) >= float(ratio[0]) and lw_ratio <= float(ratio[1]):
-                    final_dict['length_width_ratio_score'] = 5
-                else:
-                    final_dict['length_width_ratio_score'] = 0
-            else:
-                pass
-                # final_dict['length_width_ratio_score'] = 'Not Applicable'
-
-        except:
-            final_dict['length_width_ratio_score'] = 0
+        lw_value = _safe_float(lw_ratio)
+        if ratio is not None:
+            final_dict['length_width_ratio_score'] = 5 * (
+                    lw_value is not None and lw_value >= float(ratio[0]) and lw_ratio <= float(ratio[1]))
+        # else:
+        #     final_dict['length_width_ratio_score'] = 'Not Applicable'
 
         if pdf_dc['table_size'] is not None:
             table = req_dict['table'].split('-')
-            try:
-                pdf_dc['table_size'] = pdf_dc['table_size'].split("%")[0]
-            except:
-                pass
+            if isinstance(pdf_dc['table_size'], str):
+                pdf_dc['table_size'] = pdf_dc['table_size'].partition('%')[0]
 
-            if pdf_dc['table_size'] == '0' or pdf_dc['table_size'] == 'ND' or pdf_dc['table_size'] == 'Not Applicable':
+            if pdf_dc['table_size'] in _ZERO_SENTINELS:
                 table_size_value = 0
             else:
-                table_size_value = float(re.findall(pattern_digi, pdf_dc["table_size"])[0].replace(',', '.'))
-            if table_size_value >= float(table[0]) and table_size_value <= float(table[1]):
-                final_dict['table_size_score'] = 5
-            else:
-                final_dict['table_size_score'] = 0
+                table_size_value = _parse_digi(pdf_dc["table_size"])
+            final_dict['table_size_score'] = 5 * (float(table[0]) <= table_size_value <= float(table[1]))
         else:
-            if affiliate_process_data is not None and affiliate_process_data:
-                if affiliate_process_data["table_size"] is not None and affiliate_process_data[
-                    "table_size"] != 'Null' and \
-                        affiliate_process_data["table_size"] != 'none' and affiliate_process_data[
-                    "table_size"] != '' and \
-                        affiliate_process_data["table_size"] != 'None' and affiliate_process_data[
-                    "table_size"] != 'false' and \
-                        affiliate_process_data["table_size"] != 'False':
-                    pdf_dc['table_size'] = affiliate_process_data['table_size']
+            if has_aff:
+                if aff.get("table_size") not in _NULLISH:
+                    pdf_dc['table_size'] = aff['table_size']
                     pdf_dc['table_size'] = pdf_dc['table_size'].split("%")[0]
                     table = req_dict['table'].split('-')
-                    table_size_value = float(
-                        re.findall(pattern_digi, affiliate_process_data["table_size"])[0].replace(',', '.'))
-                    if table_size_value >= float(table[0]) and table_size_value <= float(table[1]):
-                        final_dict['table_size_score'] = 5
-                    else:
-                        final_dict['table_size_score'] = 0
+                    table_size_value = _parse_digi(aff["table_size"])
+                    final_dict['table_size_score'] = 5 * (float(table[0]) <= table_size_value <= float(table[1]))
                 else:
-                    pdf_dc['table_size'] = "ND"
+                    pdf_dc['table_size'] = _ND
                     final_dict['table_size_score'] = 0
 
             else:
-                pdf_dc['table_size'] = "ND"
+                pdf_dc['table_size'] = _ND
                 final_dict['table_size_score'] = 0
         # else:
         #     pdf_dc['table_size'] = "ND"
         #     final_dict['table_size_score'] = 0
         if pdf_dc['depth'] is not None:
             depth = req_dict['depth'].split('-')
-            if pdf_dc["depth"] == '0' or pdf_dc["depth"] == 'ND' or pdf_dc["depth"] == 'Not Applicable':
+            if pdf_dc['depth'] in _ZERO_SENTINELS:
                 depth_value = 0
             else:
-                depth_value = float(re.findall(pattern_digi, pdf_dc["depth"])[0].replace(',', '.'))
-            if depth_value >= float(depth[0]) and depth_value <= float(depth[1]):
-                final_dict['depth_score'] = 5
-            else:
-                final_dict['depth_score'] = 0
+                depth_value = _parse_digi(pdf_dc["depth"])
+            final_dict['depth_score'] = 5 * (float(depth[0]) <= depth_value <= float(depth[1]))
         else:
-            if affiliate_process_data is not None and affiliate_process_data:
-                if affiliate_process_data["depth"] is not None and affiliate_process_data["depth"] != 'null' and \
-                        affiliate_process_data["depth"] != 'Null' and affiliate_process_data[
-                    "depth"] != 'false' and affiliate_process_data["depth"] != 'False' and affiliate_process_data[
-                    "depth"] != 'none' and affiliate_process_data["depth"] != 'None' and affiliate_process_data[
-                    "depth"] != '':
-                    pdf_dc["depth"] = affiliate_process_data['depth']
+            if has_aff:
+                if aff.get("depth") not in _NULLISH:
+                    pdf_dc["depth"] = aff['depth']
                     depth = req_dict['depth'].split('-')
-                    depth_value = float(re.findall(pattern_digi, pdf_dc["depth"])[0].replace(',', '.'))
-                    if depth_value >= float(depth[0]) and depth_value <= float(depth[1]):
-                        final_dict['depth_score'] = 5
-                    else:
-                        final_dict['depth_score'] = 0
+                    depth_value = _parse_digi(pdf_dc["depth"])
+                    final_dict['depth_score'] = 5 * (float(depth[0]) <= depth_value <= float(depth[1]))
                 else:
-                    pdf_dc['depth'] = "ND"
+                    pdf_dc['depth'] = _ND
                     final_dict['depth_score'] = 0
             else:
-                pdf_dc['depth'] = "ND"
+                pdf_dc['depth'] = _ND
                 final_dict['depth_score'] = 0
 
         # else:
         #     pdf_dc['depth'] = "ND"
         # assign_girdle_value_for_heart(girdle_gia, characteristic_data)
         #     final_dict['depth_score'] = 0
-        if affiliate_process_data is not None and affiliate_process_data:
-            if affiliate_process_data['shape'] is not None:
-                pdf_dc['shape'] = affiliate_process_data['shape']
+        if has_aff:
+            if aff['shape'] is not None:
+                pdf_dc['shape'] = aff['shape']
         # else:
         #     if pdf_dc["shape"] != "ND" or pdf_dc["shape"] is not None:
 
-        if pdf_dc["measurement"] == "ND" or pdf_dc["measurement"] is None:
-            pass
-        else:
-            if ratio is not None:
-                pdf_dc['length_width_ratio'] = float(lw_ratio)
+        if pdf_dc["measurement"] not in _UNSET and ratio is not None:
+            pdf_dc['length_width_ratio'] = float(lw_ratio)
 
-        if pdf_dc['girdle'] == 'none' or pdf_dc['girdle'] == 'false' or pdf_dc['girdle'] == 'None':
-            pdf_dc['girdle'] = "ND"
-        if pdf_dc['girdle'] == "ND" or pdf_dc["girdle"] is None:
+        girdle = pdf_dc['girdle']
+        if girdle in _GIRDLE_UNSET:
+            if girdle is not None:
+                pdf_dc['girdle'] = _ND
             final_dict['girdle_score'] = 0
         else:
-            if pdf_dc["shape"] != "ND" or pdf_dc["shape"] is not None:
+            if pdf_dc["shape"] != _ND or pdf_dc["shape"] is not None:
                 if 'heart' in pdf_dc['shape'].lower():
                     girdle_point = assign_girdle_value_for_heart(girdle_gia, characteristic_data)
                 else:
@@ -783,20 +837,20 @@ def fetch_data(req_dc, pdf_dc, affiliate_process_data, shape=None):
             # girdle_point = check_girdle(gridle, girdle_gia, characteristic_data)
             final_dict['girdle_score'] = girdle_point
 
-        if pdf_dc['polish'] == "ND" or pdf_dc['polish'] is None:
+        if pdf_dc['polish'] in _UNSET:
             final_dict['polish_score'] = 0
         else:
             # polish_value = "fair"
-            polish_point = check_polish("None", polish_value, characteristic_data)
+            polish_point = _cached_check(check_polish, "None", polish_value)
             final_dict['polish_score'] = polish_point
-        if pdf_dc['symmetry'] == 'ND' or pdf_dc["symmetry"] is None:
+        if pdf_dc['symmetry'] in _UNSET:
             final_dict['symmetry_score'] = 0
         else:
-            symmetry_point = check_symmetry('None', symmetry_value, characteristic_data)
+            symmetry_point = _cached_check(check_symmetry, 'None', symmetry_value)
             final_dict['symmetry_score'] = symmetry_point
 
         if pdf_dc['fluorescence'] is not None and pdf_dc['color_grade'] is not None:
-            value = check_fluorescence(pdf_dc['fluorescence'], characteristic_data, pdf_dc['color_grade'])
+            value = _cached_check(check_fluorescence, pdf_dc['fluorescence'], Color_Grade=pdf_dc['color_grade'])
             if value is None:
                 # pass
                 final_dict['fluorescence_score'] = 0
@@ -804,13 +858,13 @@ def fetch_data(req_dc, pdf_dc, affiliate_process_data, shape=None):
                 final_dict['fluorescence_score'] = value
 
         else:
-            if affiliate_process_data is not None:
-                if affiliate_process_data['fluorescence'] is not None and affiliate_process_data[
+            if has_aff:
+                if aff['fluorescence'] is not None and aff[
                     'color_grade'] is not None:
-                    pdf_dc['fluorescence'] = affiliate_process_data['fluorescence']
-                    pdf_dc['color_grade'] = affiliate_process_data['color_grade']
+                    pdf_dc['fluorescence'] = aff['fluorescence']
+                    pdf_dc['color_grade'] = aff['color_grade']
 
-                    value = check_fluorescence(pdf_dc['fluorescence'], characteristic_data, pdf_dc['color_grade'])
+                    value = _cached_check(check_fluorescence, pdf_dc['fluorescence'], Color_Grade=pdf_dc['color_grade'])
                     if value is None:
                         # pass
                         final_dict['fluorescence_score'] = 0
@@ -819,15 +873,15 @@ def fetch_data(req_dc, pdf_dc, affiliate_process_data, shape=None):
                 else:
                     final_dict['fluorescence_score'] = 0
                     if pdf_dc['fluorescence'] is None:
-                        pdf_dc["fluorescence"] = 'ND'
+                        pdf_dc["fluorescence"] = _ND
                     if pdf_dc['color_grade'] is None:
-                        pdf_dc["color_grade"] = 'ND'
+                        pdf_dc["color_grade"] = _ND
             else:
                 final_dict['fluorescence_score'] = 0
                 if pdf_dc['fluorescence'] is None:
-                    pdf_dc["fluorescence"] = 'ND'
+                    pdf_dc["fluorescence"] = _ND
                 if pdf_dc['color_grade'] is None:
-                    pdf_dc["color_grade"] = 'ND'
+                    pdf_dc["color_grade"] = _ND
 
         if pdf_dc["key_to_symbol"] is not None:
             symbol_value = check_symbol(pdf_dc['key_to_symbol'], characteristic_data)
@@ -836,59 +890,39 @@ def fetch_data(req_dc, pdf_dc, affiliate_process_data, shape=None):
         else:
             final_dict['key_to_symbol_score'] = 5
 
-        total_marks = sum(list(final_dict.values()))
-        overall_marks = ((int(len(final_dict.values()))) * 5)
-        percent = (total_marks / overall_marks) * 100
+        percent = sum(final_dict.values()) / (len(final_dict) * 5) * 100
         # final_dict['symbol_score'] = None
-        final_dict['digisation_score'] = f'{round(percent, 2)}%'
+        final_dict['digisation_score'] = f'{percent:.2f}%'
         logger.debug(
             "Non-round fetch_data completed for shape=%s with digisation_score=%s",
             pdf_dc.get("shape"),
             final_dict['digisation_score'],
         )
         score_dict = score_info_dict(final_dict)
-        score_dict, pdf_dc = dict_np(score_dict, pdf_dc)
+        pdf_dc = _fill_not_applicable(pdf_dc)
         return score_dict, pdf_dc_new, pdf_dc
     else:
         logger.warning("fetch_data: cannot determine shape from data, returning error status")
         return {"Status": "can't find shape from data"}, pdf_dc_new, pdf_dc
 
 
+def _girdle_values(characteristic_json, name):
+    if characteristic_json is characteristic_data:
+        return _GIRDLE_VALUES[name]
+    return _casefold_index(_characteristic_info(characteristic_json, name))
+
+
 def assign_girdle_value(value, characteristic_json):
-    info = None
-    assign_value = 0
-    for data in characteristic_json:
-        if data['characteristic_name'] == "GIRDLE THICKNESS":
-            info = data['characteristic_data']
-            break
-    for i in info:
-        if i['name'].lower() == value.lower():
-            assign_value = i['value']
-            return assign_value
-    return assign_value
+    return _girdle_values(characteristic_json, "GIRDLE THICKNESS").get(value.casefold(), 0)
 
 
 def assign_girdle_value_for_heart(value, characteristic_json):
-    info = None
-    assign_value = 0
-    for data in characteristic_json:
-        if data['characteristic_name'] == "GIRDLE THICKNESS HEART":
-            info = data['characteristic_data']
-            break
-    for i in info:
-        if i['name'].lower() == value.lower():
-            assign_value = i['value']
-            return assign_value
-    return assign_value
+    return _girdle_values(characteristic_json, "GIRDLE THICKNESS HEART").get(value.casefold(), 0)
 
 
 def assign_measurement_value(value, carat, characteristic_json):
-    info = None
+    info = _characteristic_info(characteristic_json, "measurement")
     assigned_value = 0
-    for data in characteristic_json:
-        if data['characteristic_name'] == "measurement":
-            info = data['characteristic_data']
-            break
     for i in info:
         w = i['weight'].split('-')
         weight_range = i["weight"].split("-")
@@ -909,11 +943,7 @@ def assign_measurement_value(value, carat, characteristic_json):
 
 
 def check_cut_grade(threshold="None", value=None, characteristic_json=None):
-    info = None
-    for data in characteristic_json:
-        if data['characteristic_name'] == "ROUND SCORE":
-            info = data['characteristic_data']
-            break
+    info = _characteristic_info(characteristic_json, "ROUND SCORE")
     if value.lower() in threshold and threshold != 'None':
         for i in info:
             if i['data_type'].lower() == value.lower():
@@ -930,68 +960,44 @@ def check_cut_grade(threshold="None", value=None, characteristic_json=None):
 
 
 def get_pavillion_angle(pdf_data, characteristic_data):
-    info = None
-    for data in characteristic_data:
-        if data['characteristic_name'] == "pavillion_angle":
-            info = data['characteristic_data']
-            break
-    info_keys = list(info.keys())
-    for key in info_keys:
-        pav_data = key.split('-')
-        if len(pav_data) == 2:
-            if pdf_data >= float(pav_data[0]) and pdf_data <= float(pav_data[1]):
-                return info[key]
-        else:
-            if pdf_data == float(pav_data[0]):
-                return info[key]
-    return 0
+    return _band_score(characteristic_data, "pavillion_angle", pdf_data)
 
 
 def get_round_crown(pdf_data, characteristic_data):
-    info = None
-    for data in characteristic_data:
-        if data['characteristic_name'] == "round_crown":
-            info = data['characteristic_data']
-            break
-    info_keys = list(info.keys())
-    for key in info_keys:
-        pav_data = key.split('-')
-        if len(pav_data) == 2:
-            if pdf_data >= float(pav_data[0]) and pdf_data <= float(pav_data[1]):
-                return info[key]
-        else:
-            if pdf_data == float(pav_data[0]):
-                return info[key]
+    return _band_score(characteristic_data, "round_crown", pdf_data)
 
-    return 0
+
+# Checked in order, first hit wins (the later checks used to overwrite the earlier ones).
+_SHAPE_OVERRIDES = (
+    (("Cut-Cornered ", "square"), "radiant sq"),
+    (("Cut-Cornered", "Rectangular"), "radiant rec"),
+    (("Square Modified",), "princess"),
+    (("Square Emerald",), "asscher"),
+)
+
+
+@lru_cache(maxsize=64)
+def _resolve_shape_key(shape_str):
+    for needles, key in _SHAPE_OVERRIDES:
+        if all(needle in shape_str for needle in needles):
+            return key
+    return shape_str.split()[0].lower()
 
 
 def get_configuration_json(pdf_dc, shape=None):
-    type = pdf_dc['shape'].split()
-    # type = pdf_dc['shape_and_style'].split()
-    if "Square Emerald" in pdf_dc['shape']:
-        type[0] = "asscher"
-    if "Square Modified" in pdf_dc['shape']:
-        type[0] = "princess"
-    if "Cut-Cornered" in pdf_dc['shape'] and "Rectangular" in pdf_dc['shape']:
-        type[0] = "radiant rec"
-    if "Cut-Cornered " in pdf_dc['shape'] and "square" in pdf_dc['shape']:
-        type[0] = "radiant sq"
-    req_dict = next(filter(lambda diamond_dict: diamond_dict["Diamond_type"] == type[0].lower(), data), None)
-    return req_dict
+    return _DIAMOND_BY_TYPE.get(_resolve_shape_key(pdf_dc['shape']))
 
 
 def check_culet(shape, culet_value, characteristic_json):
-    info = None
-    for data in characteristic_json:
-        if data['characteristic_name'] == "culet":
-            info = data['characteristic_data']
-            break
-    for d in info:
-        if d["shape"].lower() in shape.lower().strip():
-            for value in d["value"]:
-                if value["name"].upper() == culet_value.upper():
-                    return value["value"]
+    if characteristic_json is characteristic_data:
+        culets = _CULET_VALUES
+    else:
+        culets = _culet_index(_characteristic_info(characteristic_json, "culet"))
+    shape_lc = shape.lower().strip()
+    culet_key = culet_value.casefold()
+    for culet_shape, values in culets:
+        if culet_shape in shape_lc and culet_key in values:
+            return values[culet_key]
     return 0
 
 
@@ -1002,119 +1008,23 @@ def fetch_data_round(req_dc, pdf_dc, affiliate_process_data, shape=None):
         bool(affiliate_process_data),
     )
     pdf_dc_new = pdf_dc.copy()
-    if affiliate_process_data is not None and affiliate_process_data:
-        if affiliate_process_data["shape"] is not None and affiliate_process_data["shape"] != '' and \
-                affiliate_process_data["shape"] != 'null' and affiliate_process_data["shape"] != 'Null' and \
-                affiliate_process_data["shape"] != 'False' and affiliate_process_data["shape"] != 'false':
-            pdf_dc['shape'] = affiliate_process_data["shape"]
-        if affiliate_process_data["carat"] is not None and affiliate_process_data["carat"] != 'false' and \
-                affiliate_process_data["carat"] != '' and affiliate_process_data["carat"] != 'none' and \
-                affiliate_process_data["carat"] != 'None' and affiliate_process_data["carat"] != 'null' and \
-                affiliate_process_data["carat"] != 'Null':
-            pdf_dc['carat'] = affiliate_process_data["carat"]
-        if affiliate_process_data["table_size"] is not None and affiliate_process_data["table_size"] != 'Null' and \
-                affiliate_process_data["table_size"] != 'none' and affiliate_process_data["table_size"] != '' and \
-                affiliate_process_data["table_size"] != 'None' and affiliate_process_data["table_size"] != 'false' and \
-                affiliate_process_data["table_size"] != 'False':
-            pdf_dc['table_size'] = affiliate_process_data["table_size"]
-        if affiliate_process_data["griddle"] is not None and affiliate_process_data["griddle"] != 'false' and \
-                affiliate_process_data["griddle"] != 'False' and affiliate_process_data["griddle"] != '' and \
-                affiliate_process_data["griddle"] != 'none' and affiliate_process_data["griddle"] != 'None' and \
-                affiliate_process_data["griddle"] != 'null' and affiliate_process_data["griddle"] != 'Null':
-            pdf_dc['girdle'] = affiliate_process_data["griddle"]
-        if affiliate_process_data["depth"] is not None and affiliate_process_data["depth"] != 'null' and \
-                affiliate_process_data["depth"] != 'Null' and affiliate_process_data[
-            "depth"] != 'false' and affiliate_process_data["depth"] != 'False' and affiliate_process_data[
-            "depth"] != 'none' and affiliate_process_data["depth"] != 'None' and affiliate_process_data["depth"] != '':
-            pdf_dc['depth'] = affiliate_process_data["depth"]
-        if affiliate_process_data["measurement"] is not None and affiliate_process_data["measurement"] != 'False' and \
-                affiliate_process_data["measurement"] != 'false' and affiliate_process_data["measurement"] != '' and \
-                affiliate_process_data["measurement"] != 'null' and affiliate_process_data["measurement"] != 'Null' and \
-                affiliate_process_data["measurement"] != 'none' and affiliate_process_data["measurement"] != 'None':
-            pdf_dc['measurement'] = affiliate_process_data["measurement"]
-        if affiliate_process_data["culet"] is not None and affiliate_process_data["culet"] != '' and \
-                affiliate_process_data["culet"] != 'false' and affiliate_process_data["culet"] != 'False' and \
-                affiliate_process_data["culet"] != 'null' and affiliate_process_data["culet"] != 'Null':
-            pdf_dc['culet'] = affiliate_process_data["culet"]
-
-        if affiliate_process_data["color"] is not None and affiliate_process_data["color"] != 'none' and \
-                affiliate_process_data["color"] != 'None' and affiliate_process_data["color"] != '' and \
-                affiliate_process_data["color"] != 'False' and affiliate_process_data["color"] != 'false' and \
-                affiliate_process_data["color"] != 'null' and affiliate_process_data["color"] != 'Null':
-            pdf_dc['color_grade'] = affiliate_process_data["color"]
-
-        if affiliate_process_data["polish"] is not None and affiliate_process_data["polish"] != 'false' and \
-                affiliate_process_data["polish"] != 'False' and affiliate_process_data["polish"] != '' and \
-                affiliate_process_data["polish"] != 'None' and affiliate_process_data["polish"] != 'none' and \
-                affiliate_process_data["polish"] != 'null' and affiliate_process_data["polish"] != 'Null':
-            pdf_dc['polish'] = affiliate_process_data["polish"]
-
-        if affiliate_process_data["symmetry"] is not None and affiliate_process_data["symmetry"] != '' and \
-                affiliate_process_data["symmetry"] != 'false' and affiliate_process_data["symmetry"] != 'False' and \
-                affiliate_process_data["symmetry"] != 'none' and affiliate_process_data["symmetry"] != 'None' and \
-                affiliate_process_data["symmetry"] != 'null' and affiliate_process_data["symmetry"] != 'Null':
-            pdf_dc['symmetry'] = affiliate_process_data["symmetry"]
-        if affiliate_process_data["fluorescence"] is not None and affiliate_process_data["fluorescence"] != '' and \
-                affiliate_process_data["fluorescence"] != 'False' and affiliate_process_data[
-            "fluorescence"] != 'false' and affiliate_process_data["fluorescence"] != 'null' and affiliate_process_data[
-            "fluorescence"] != 'Null':
-            pdf_dc['fluorescence'] = affiliate_process_data["fluorescence"]
-        if affiliate_process_data["cut"] is not None and affiliate_process_data["cut"] != '' and affiliate_process_data[
-            "cut"] != 'none' and affiliate_process_data["cut"] != 'None' and affiliate_process_data[
-            "cut"] != 'false' and affiliate_process_data["cut"] != 'False' and affiliate_process_data[
-            "cut"] != 'null' and affiliate_process_data["cut"] != 'Null':
-            pdf_dc['cut'] = affiliate_process_data["cut"]
-        if affiliate_process_data["pavilion_height"] is not None and affiliate_process_data[
-            "pavilion_height"] != 'false' and affiliate_process_data["pavilion_height"] != '' and \
-                affiliate_process_data["pavilion_height"] != 'False' and affiliate_process_data[
-            "pavilion_height"] != 'none' and affiliate_process_data["pavilion_height"] != 'None' and \
-                affiliate_process_data["pavilion_height"] != 'null' and affiliate_process_data[
-            "pavilion_height"] != 'Null' and affiliate_process_data["pavilion_height"] != '0.0000':
-            pdf_dc['pavilion_height'] = affiliate_process_data["pavilion_height"]
-        if affiliate_process_data["pavilion_angle"] is not None and affiliate_process_data[
-            "pavilion_angle"] != 'false' and affiliate_process_data["pavilion_angle"] != '' and affiliate_process_data[
-            "pavilion_angle"] != 'False' and affiliate_process_data["pavilion_angle"] != 'none' and \
-                affiliate_process_data["pavilion_angle"] != 'None' and affiliate_process_data[
-            "pavilion_angle"] != 'null' and affiliate_process_data["pavilion_angle"] != 'Null' and \
-                affiliate_process_data["pavilion_angle"] != '0.0000':
-            pdf_dc['pavilion_angle'] = affiliate_process_data["pavilion_angle"]
-        if affiliate_process_data["crown_height"] is not None and affiliate_process_data["crown_height"] != '' and \
-                affiliate_process_data["crown_height"] != 'false' and affiliate_process_data[
-            "crown_height"] != 'False' and affiliate_process_data["crown_height"] != 'none' and affiliate_process_data[
-            "crown_height"] != 'None' and affiliate_process_data["crown_height"] != 'null' and affiliate_process_data[
-            "crown_height"] != 'Null':
-            pdf_dc['crown_height'] = affiliate_process_data["crown_height"]
-        if affiliate_process_data["crown_angle"] is not None and affiliate_process_data["crown_angle"] != '' and \
-                affiliate_process_data["crown_angle"] != 'False' and affiliate_process_data[
-            "crown_angle"] != 'false' and affiliate_process_data["crown_angle"] != 'none' and affiliate_process_data[
-            "crown_angle"] != 'None' and affiliate_process_data["crown_angle"] != 'null' and affiliate_process_data[
-            "crown_angle"] != 'Null':
-            pdf_dc['crown_angle'] = affiliate_process_data["crown_angle"]
+    aff = affiliate_process_data or None
+    has_aff = aff is not None
+    _merge_affiliate(pdf_dc, aff, _AFFILIATE_COPY_ROUND)
     if 'shape' in pdf_dc:
         type = pdf_dc['shape'].split()
         last_mea = None
         if 'measurement' in pdf_dc:
             if pdf_dc['measurement'] is not None:
-                last_mea = pdf_dc['measurement'].split('*')[0]
-                last_mea = last_mea.split('x')[0]
-                last_mea = last_mea.split('X')[0]
+                last_mea = _MEA_SEP.split(pdf_dc['measurement'], 1)[0]
         else:
-            if affiliate_process_data is not None and affiliate_process_data:
-                if affiliate_process_data["measurement"] is not None and affiliate_process_data[
-                    "measurement"] != 'False' and \
-                        affiliate_process_data["measurement"] != 'false' and affiliate_process_data[
-                    "measurement"] != '' and \
-                        affiliate_process_data["measurement"] != 'null' and affiliate_process_data[
-                    "measurement"] != 'Null' and \
-                        affiliate_process_data["measurement"] != 'none' and affiliate_process_data[
-                    "measurement"] != 'None':
-
-                    pdf_dc['measurement'] = affiliate_process_data['measurement']
+            if has_aff:
+                if aff.get("measurement") not in _NULLISH:
+
+                    pdf_dc['measurement'] = aff['measurement']
                     if 'measurement' in pdf_dc:
                         if pdf_dc['measurement'] is not None:
-                            last_mea = pdf_dc['measurement'].split('*')[0]
-                            last_mea = last_mea.split('x')[0]
-                            last_mea = last_mea.split('X')[0]
+                            last_mea = _MEA_SEP.split(pdf_dc['measurement'], 1)[0]
 
         final_dict = {}
 
@@ -1124,158 +1034,49 @@ def fetch_data_round(req_dc, pdf_dc, affiliate_process_data, shape=None):
             req_dict = next(filter(lambda diamond_dict: diamond_dict["Diamond_type"] == shape, req_dc), None)
 
         req_dict = req_dict['Diamonds_req'] if req_dict else None
-        table = req_dict['table'].split('-')
-        depth = req_dict['depth'].split('-')
-        pavilion_angle = req_dict['pavilion_angle'].split('-')
-        pavilion_depth = req_dict['pavilion_depth'].split('-')
-        # crown_angle = req_dict['crown_angle'].split('-')
-        if 'girdle' in pdf_dc and pdf_dc['girdle'] is not None:
-            gridle_ls = pdf_dc['girdle'].split()
-            if len(gridle_ls) != 1:
-                if "(" in gridle_ls[-2]:
-                    del gridle_ls[-2]
-                if "%" in gridle_ls[-1]:
-                    del gridle_ls[-1]
-                girdle_gia = ' '.join(gridle_ls)
-            else:
-                girdle_gia = pdf_dc['girdle']
-        else:
-            if affiliate_process_data is not None and affiliate_process_data:
-                if affiliate_process_data["griddle"] is not None and affiliate_process_data["griddle"] != 'false' and \
-                        affiliate_process_data["griddle"] != 'False' and affiliate_process_data["griddle"] != '' and \
-                        affiliate_process_data["griddle"] != 'none' and affiliate_process_data["griddle"] != 'None' and \
-                        affiliate_process_data["griddle"] != 'null' and affiliate_process_data["griddle"] != 'Null':
-
-                    pdf_dc['girdle'] = affiliate_process_data['girdle']
-                    if 'girdle' in pdf_dc and pdf_dc['girdle'] is not None:
-                        gridle_ls = pdf_dc['girdle'].split()
-                        if len(gridle_ls) != 1:
-                            if "(" in gridle_ls[-2]:
-                                del gridle_ls[-2]
-                            if "%" in gridle_ls[-1]:
-                                del gridle_ls[-1]
-                            girdle_gia = ' '.join(gridle_ls)
-                        else:
-                            girdle_gia = pdf_dc['girdle']
-                    else:
-                        pdf_dc['girdle'] = "ND"
-                        girdle_gia = 'None'
-                else:
-                    pdf_dc['girdle'] = "ND"
-                    girdle_gia = 'None'
-            else:
-                pdf_dc['girdle'] = "ND"
-                girdle_gia = 'None'
-        if 'polish' in pdf_dc and pdf_dc["polish"] is not None:
-            polish_value = pdf_dc['polish']
-
-        else:
-            if affiliate_process_data is not None and affiliate_process_data:
-                if affiliate_process_data["polish"] is not None and affiliate_process_data["polish"] != 'false' and \
-                        affiliate_process_data["polish"] != 'False' and affiliate_process_data["polish"] != '' and \
-                        affiliate_process_data["polish"] != 'None' and affiliate_process_data["polish"] != 'none' and \
-                        affiliate_process_data["polish"] != 'null' and affiliate_process_data["polish"] != 'Null':
-                    pdf_dc['polish'] = affiliate_process_data['polish']
-                    if 'polish' in pdf_dc and pdf_dc["polish"] is not None:
-                        polish_value = pdf_dc['polish']
-                    else:
-                        polish_value = 'None'
-                        pdf_dc['polish'] = "ND"
-                else:
-                    polish_value = 'None'
-                    pdf_dc['polish'] = "ND"
-
-            else:
-                polish_value = 'None'
-                pdf_dc['polish'] = "ND"
-        # thres_polish = req_dict['polish']
-        if 'symmetry' in pdf_dc and pdf_dc["symmetry"] is not None:
-            symmetry_value = pdf_dc['symmetry']
+        table_lo, table_hi = map(float, req_dict['table'].split('-'))
+        depth_lo, depth_hi = map(float, req_dict['depth'].split('-'))
+        pav_angle_lo, pav_angle_hi = map(float, req_dict['pavilion_angle'].split('-'))
+        pav_depth_lo, pav_depth_hi = map(float, req_dict['pavilion_depth'].split('-'))
+        crown_lo, crown_hi = map(float, req_dict['crown_angle'].split('-'))
+        if pdf_dc.get('girdle') is not None:
+            girdle_gia = _clean_girdle(pdf_dc['girdle'])
         else:
-            if affiliate_process_data is not None and affiliate_process_data:
-                if affiliate_process_data["symmetry"] is not None and affiliate_process_data["symmetry"] != '' and \
-                        affiliate_process_data["symmetry"] != 'false' and affiliate_process_data[
-                    "symmetry"] != 'False' and \
-                        affiliate_process_data["symmetry"] != 'none' and affiliate_process_data[
-                    "symmetry"] != 'None' and \
-                        affiliate_process_data["symmetry"] != 'null' and affiliate_process_data["symmetry"] != 'Null':
-                    pdf_dc['symmetry'] = affiliate_process_data['symmetry']
-                    if 'symmetry' in pdf_dc and pdf_dc["symmetry"] is not None:
-                        symmetry_value = pdf_dc['symmetry']
-                    else:
-                        symmetry_value = 'None'
-                        pdf_dc['symmetry'] = "ND"
-                else:
-                    symmetry_value = 'None'
-                    pdf_dc['symmetry'] = "ND"
-            else:
-                symmetry_value = 'None'
-                pdf_dc['symmetry'] = "ND"
+            if has_aff:
+                if aff.get("griddle") not in _NULLISH:
 
-        if 'cut' in pdf_dc and pdf_dc["cut"] is not None:
-            cut_grade_value = pdf_dc['cut']
-        else:
-            if affiliate_process_data is not None and affiliate_process_data:
-                if affiliate_process_data["cut"] is not None and affiliate_process_data["cut"] != '' and \
-                        affiliate_process_data[
-                            "cut"] != 'none' and affiliate_process_data["cut"] != 'None' and affiliate_process_data[
-                    "cut"] != 'false' and affiliate_process_data["cut"] != 'False' and affiliate_process_data[
-                    "cut"] != 'null' and affiliate_process_data["cut"] != 'Null':
-                    pdf_dc['cut'] = affiliate_process_data['cut']
-                    if 'cut' in pdf_dc and pdf_dc["cut"] is not None:
-                        cut_grade_value = pdf_dc['cut']
+                    pdf_dc['girdle'] = aff['girdle']
+                    if pdf_dc.get('girdle') is not None:
+                        girdle_gia = _clean_girdle(pdf_dc['girdle'])
                     else:
-                        cut_grade_value = 'None'
-                        pdf_dc['cut'] = "ND"
+                        pdf_dc['girdle'] = _ND
+                        girdle_gia = _NONE_TAG
                 else:
-                    cut_grade_value = 'None'
-                    pdf_dc['cut'] = "ND"
+                    pdf_dc['girdle'] = _ND
+                    girdle_gia = _NONE_TAG
             else:
-                cut_grade_value = 'None'
-                pdf_dc['cut'] = "ND"
-
-        if "culet" in pdf_dc and pdf_dc['culet'] is not None:
-            culet_point = check_culet("round", pdf_dc["culet"], characteristic_data)
-            final_dict['culet_score'] = culet_point
+                pdf_dc['girdle'] = _ND
+                girdle_gia = _NONE_TAG
+        polish_value, symmetry_value, cut_grade_value = [_resolve(pdf_dc, aff, key) for key in _GRADE_FIELDS]
 
+        culet_value = _resolve(pdf_dc, aff, "culet", _NULLISH_KEEP_NONE)
+        if culet_value is None:
+            final_dict['culet_score'] = 0
         else:
-            if affiliate_process_data is not None and affiliate_process_data:
-                if affiliate_process_data["culet"] is not None and affiliate_process_data["culet"] != '' and \
-                        affiliate_process_data["culet"] != 'false' and affiliate_process_data["culet"] != 'False' and \
-                        affiliate_process_data["culet"] != 'null' and affiliate_process_data["culet"] != 'Null':
-                    pdf_dc['culet'] = affiliate_process_data['culet']
-                    if "culet" in pdf_dc and pdf_dc['culet'] is not None:
-                        culet_point = check_culet("round", pdf_dc["culet"], characteristic_data)
-                        final_dict['culet_score'] = culet_point
-                    else:
-                        pdf_dc["culet"] = "ND"
-                        final_dict['culet_score'] = 0
-                else:
-                    pdf_dc["culet"] = "ND"
-                    final_dict['culet_score'] = 0
-            else:
-                pdf_dc["culet"] = "ND"
-                final_dict['culet_score'] = 0
-
+            final_dict['culet_score'] = check_culet("round", culet_value, characteristic_data)
 
         carat = 0
         if pdf_dc["carat"] is not None:
-            try:
-                carat = float(pdf_dc["carat"].split(' ')[0])
-            except:
-                carat = pdf_dc["carat"]
-
-        if affiliate_process_data is not None and affiliate_process_data:
-            if affiliate_process_data["carat"] is not None and affiliate_process_data["carat"] != 'false' and \
-                    affiliate_process_data["carat"] != '' and affiliate_process_data["carat"] != 'none' and \
-                    affiliate_process_data["carat"] != 'None' and affiliate_process_data["carat"] != 'null' and \
-                    affiliate_process_data["carat"] != 'Null':
-                carat = affiliate_process_data['carat']
-                pdf_dc["carat"] = affiliate_process_data['carat']
+            carat = _parse_carat(pdf_dc["carat"])
+
+        if has_aff:
+            if aff.get("carat") not in _NULLISH:
+                carat = aff['carat']
+                pdf_dc["carat"] = aff['carat']
             else:
                 pdf_dc["carat"] = 0
 
-        if 'measurement' in pdf_dc and pdf_dc['measurement'] is not None:
+        if pdf_dc.get('measurement') is not None:
             if last_mea is not None:
                 try:
                     measurement_score = assign_measurement_value(float(last_mea), carat, characteristic_data)
@@ -1286,216 +1087,75 @@ def fetch_data_round(req_dc, pdf_dc, affiliate_process_data, shape=None):
                 final_dict['measurement_score'] = 0
 
         else:
-            pdf_dc["measurement"] = "ND"
+            pdf_dc["measurement"] = _ND
             final_dict['measurement_score'] = 0
 
-        if 'pavilion_height' in pdf_dc and pdf_dc["pavilion_height"] is not None and pdf_dc[
-            "pavilion_height"] != 'false' and pdf_dc["pavilion_height"] != '' and pdf_dc["pavilion_height"] != 'ND' and \
-                pdf_dc['pavilion_height'] != 'Not Applicable' and pdf_dc['pavilion_height'] != '1':
-            pavillion_value = float(re.findall(pattern_digi, pdf_dc["pavilion_height"])[0].replace(',', '.'))
-            if pavillion_value >= float(pavilion_depth[0]) and pavillion_value <= float(pavilion_depth[1]):
-                final_dict['pavilion_height_score'] = 5
-            else:
-                final_dict['pavilion_height_score'] = 0
-        else:
-            if affiliate_process_data is not None and affiliate_process_data:
-                pdf_dc['pavilion_height'] = affiliate_process_data['pavilion_height']
-                if 'pavilion_height' in pdf_dc and pdf_dc["pavilion_height"] is not None and pdf_dc[
-                    "pavilion_height"] != 'false' and pdf_dc["pavilion_height"] != '' and pdf_dc[
-                    'pavilion_height'] != '1':
-                    pavillion_value = float(re.findall(pattern_digi, pdf_dc["pavilion_height"])[0].replace(',', '.'))
-                    if pavillion_value >= float(pavilion_depth[0]) and pavillion_value <= float(pavilion_depth[1]):
-                        final_dict['pavilion_height_score'] = 5
-                    else:
-                        final_dict['pavilion_height_score'] = 0
-                else:
-                    pdf_dc["pavilion_height"] = "ND"
-                    final_dict['pavilion_height_score'] = 0
-            else:
-                pdf_dc["pavilion_height"] = "ND"
-                final_dict['pavilion_height_score'] = 0
-
-        if "pavilion_angle" in pdf_dc and pdf_dc["pavilion_angle"] is not None and pdf_dc[
-            "pavilion_angle"] != 'false' and pdf_dc["pavilion_angle"] != '' and pdf_dc["pavilion_angle"] != 'ND' and \
-                pdf_dc["pavilion_angle"] != 'Not Applicable' and pdf_dc["pavilion_angle"] != '1':
-            pavillion_angle_value = float(re.findall(pattern_digi, pdf_dc["pavilion_angle"])[0].replace(',', '.'))
-            if pavillion_angle_value >= float(pavilion_angle[0]) and pavillion_angle_value <= float(pavilion_angle[1]):
-                final_dict['pavilion_angle_score'] = 5
-            else:
-                pavilion_score = get_pavillion_angle(pavillion_angle_value, characteristic_data)
-                final_dict['pavilion_angle_score'] = pavilion_score
-        else:
-            if affiliate_process_data is not None and affiliate_process_data:
-                pdf_dc['pavilion_angle'] = affiliate_process_data['pavilion_angle']
-                if "pavilion_angle" in pdf_dc and pdf_dc["pavilion_angle"] is not None and pdf_dc[
-                    "pavilion_angle"] != 'false' and pdf_dc["pavilion_angle"] != '' and pdf_dc["pavilion_angle"] != '1':
-                    pavillion_angle_value = float(
-                        re.findall(pattern_digi, pdf_dc["pavilion_angle"])[0].replace(',', '.'))
-                    if pavillion_angle_value >= float(pavilion_angle[0]) and pavillion_angle_value <= float(
-                            pavilion_angle[1]):
-                        final_dict['pavilion_angle_score'] = 5
-                    else:
-                        pavilion_score = get_pavillion_angle(pavillion_angle_value, characteristic_data)
-                        final_dict['pavilion_angle_score'] = pavilion_score
-                else:
-                    # pdf_dc["pavilion_angle_score"] = "ND"
-                    pdf_dc["pavilion_angle"] = "ND"
-                    final_dict['pavilion_angle_score'] = 0
-            else:
-                pdf_dc["pavilion_angle"] = "ND"
-                final_dict['pavilion_angle_score'] = 0
-
-        if "crown_angle" in pdf_dc and pdf_dc["crown_angle"] is not None and pdf_dc["crown_angle"] != '' and pdf_dc[
-            "crown_angle"] != 'false' and pdf_dc["crown_angle"] != 'none' and pdf_dc["crown_angle"] != 'ND' and pdf_dc[
-            "crown_angle"] != 'Not Applicable' and pdf_dc["crown_angle"] != '1':
-            crown_angle_value = float(re.findall(pattern_digi, pdf_dc["crown_angle"])[0].replace(',', '.'))
+        # Each numeric field is parsed once (None when ND)
+        pav_h = _resolve_number(pdf_dc, aff, "pavilion_height", _PAVILION_INVALID, _PAVILION_AFF_INVALID)
+        pav_a = _resolve_number(pdf_dc, aff, "pavilion_angle", _PAVILION_INVALID, _PAVILION_AFF_INVALID)
+        crown_a = _resolve_number(pdf_dc, aff, "crown_angle", _CROWN_INVALID, _CROWN_AFF_INVALID)
+        table = _resolve_number(pdf_dc, aff, "table_size", _MISSING, _NULLISH, _ZERO_SENTINELS)
+        depth = _resolve_number(pdf_dc, aff, "depth", _MISSING, _NULLISH, _ZERO_SENTINELS)
 
-            crown_angle = req_dict['crown_angle'].split('-')
+        final_dict['pavilion_height_score'] = 0 if pav_h is None else 5 * (pav_depth_lo <= pav_h <= pav_depth_hi)
 
-            if crown_angle_value >= float(crown_angle[0]) and crown_angle_value <= float(crown_angle[1]):
-                final_dict['crown_angle_score'] = 5
-            else:
-                crown_angle_score = get_round_crown(crown_angle_value, characteristic_data)
-                final_dict['crown_angle_score'] = crown_angle_score
+        if pav_a is None:
+            final_dict['pavilion_angle_score'] = 0
+        elif pav_angle_lo <= pav_a <= pav_angle_hi:
+            final_dict['pavilion_angle_score'] = 5
         else:
-            if affiliate_process_data is not None and affiliate_process_data:
-                pdf_dc['crown_angle'] = affiliate_process_data['crown_angle']
-                if "crown_angle" in pdf_dc and pdf_dc["crown_angle"] is not None and pdf_dc["crown_angle"] != '' and \
-                        pdf_dc["crown_angle"] != 'false' and pdf_dc["crown_angle"] != 'none' and pdf_dc[
-                    "crown_angle"] != 'ND' and pdf_dc["crown_angle"] != '1':
-                    crown_angle = req_dict['crown_angle'].split('-')
-                    crown_angle_value = float(re.findall(pattern_digi, pdf_dc["crown_angle"])[0].replace(',', '.'))
-                    if crown_angle_value >= float(crown_angle[0]) and crown_angle_value <= float(crown_angle[1]):
-                        final_dict['crown_angle_score'] = 5
-                    else:
-                        crown_angle_score = get_round_crown(crown_angle_value, characteristic_data)
-                        final_dict['crown_angle_score'] = crown_angle_score
+            final_dict['pavilion_angle_score'] = get_pavillion_angle(pav_a, characteristic_data)
 
-                else:
-                    pdf_dc["crown_angle"] = "ND"
-                    final_dict['crown_angle_score'] = 0
-            else:
-                pdf_dc["crown_angle"] = "ND"
-                final_dict['crown_angle_score'] = 0
-
-        if "table_size" in pdf_dc and pdf_dc["table_size"] is not None:
-            if pdf_dc['table_size'] == '0' or pdf_dc["table_size"] == 'ND' or pdf_dc["table_size"] == 'Not Applicable':
-                table_size_value = 0
-            else:
-                table_size_value = float(re.findall(pattern_digi, pdf_dc["table_size"])[0].replace(',', '.'))
-
-            # table_size_value = float(re.findall(pattern_digi, pdf_dc["table_size"])[0].replace(',', '.'))
-            if table_size_value >= float(table[0]) and table_size_value <= float(table[1]):
-                final_dict['table_size_score'] = 5
-            else:
-                final_dict['table_size_score'] = 0
-        else:
-            if affiliate_process_data is not None and affiliate_process_data:
-                if affiliate_process_data["table_size"] is not None and affiliate_process_data[
-                    "table_size"] != 'Null' and \
-                        affiliate_process_data["table_size"] != 'none' and affiliate_process_data[
-                    "table_size"] != '' and \
-                        affiliate_process_data["table_size"] != 'None' and affiliate_process_data[
-                    "table_size"] != 'false' and \
-                        affiliate_process_data["table_size"] != 'False':
-                    pdf_dc['table_size'] = affiliate_process_data['table_size']
-                    if "table_size" in pdf_dc and pdf_dc["table_size"] is not None:
-                        if pdf_dc['table_size'] == '0':
-                            table_size_value = 0
-                        else:
-                            table_size_value = float(
-                                re.findall(pattern_digi, pdf_dc["table_size"])[0].replace(',', '.'))
-
-                        # table_size_value = float(re.findall(pattern_digi, pdf_dc["table_size"])[0].replace(',', '.'))
-                        if table_size_value >= float(table[0]) and table_size_value <= float(table[1]):
-                            final_dict['table_size_score'] = 5
-                        else:
-                            final_dict['table_size_score'] = 0
-                    else:
-                        pdf_dc["table_size"] = "ND"
-                        final_dict['table_size_score'] = 0
-                else:
-                    pdf_dc["table_size"] = "ND"
-                    final_dict['table_size_score'] = 0
-            else:
-                pdf_dc["table_size"] = "ND"
-                final_dict['table_size_score'] = 0
-
-        if "depth" in pdf_dc and pdf_dc["depth"] is not None:
-            if pdf_dc['depth'] == '0' or pdf_dc["depth"] == 'ND' or pdf_dc["depth"] == 'Not Applicable':
-                depth_value = 0
-            else:
-                depth_value = float(re.findall(pattern_digi, pdf_dc["depth"])[0].replace(',', '.'))
-
-            # depth_value = float(re.findall(pattern_digi, pdf_dc["depth"])[0].replace(',', '.'))
-            if float(depth_value) >= float(depth[0]) and depth_value <= float(depth[1]):
-                final_dict['depth_score'] = 5
-            else:
-                final_dict['depth_score'] = 0
+        if crown_a is None:
+            final_dict['crown_angle_score'] = 0
+        elif crown_lo <= crown_a <= crown_hi:
+            final_dict['crown_angle_score'] = 5
         else:
-            if affiliate_process_data is not None and affiliate_process_data:
-                if affiliate_process_data["depth"] is not None and affiliate_process_data["depth"] != 'null' and \
-                        affiliate_process_data["depth"] != 'Null' and affiliate_process_data[
-                    "depth"] != 'false' and affiliate_process_data["depth"] != 'False' and affiliate_process_data[
-                    "depth"] != 'none' and affiliate_process_data["depth"] != 'None' and affiliate_process_data[
-                    "depth"] != '':
-                    pdf_dc['depth'] = affiliate_process_data['depth']
-                    if "depth" in pdf_dc and pdf_dc["depth"] is not None:
-                        depth_value = float(re.findall(pattern_digi, pdf_dc["depth"])[0].replace(',', '.'))
-                        if float(depth_value) >= float(depth[0]) and depth_value <= float(depth[1]):
-                            final_dict['depth_score'] = 5
-                        else:
-                            final_dict['depth_score'] = 0
-                    else:
-                        pdf_dc["depth"] = "ND"
-                        final_dict['depth_score'] = 0
-                else:
-                    pdf_dc["depth"] = "ND"
-                    final_dict['depth_score'] = 0
-            else:
-                pdf_dc["depth"] = "ND"
-                final_dict['depth_score'] = 0
+            final_dict['crown_angle_score'] = get_round_crown(crown_a, characteristic_data)
 
-        if pdf_dc['girdle'] == 'none' or pdf_dc['girdle'] == 'false' or pdf_dc['girdle'] == 'None':
-            pdf_dc['girdle'] = "ND"
+        final_dict['table_size_score'] = 0 if table is None else 5 * (table_lo <= table <= table_hi)
+        final_dict['depth_score'] = 0 if depth is None else 5 * (depth_lo <= depth <= depth_hi)
 
-        if pdf_dc['girdle'] == "ND" or pdf_dc["girdle"] is None:
+        girdle = pdf_dc['girdle']
+        if girdle in _GIRDLE_UNSET:
+            if girdle is not None:
+                pdf_dc['girdle'] = _ND
             final_dict['girdle_score'] = 0
         else:
             # girdle_point = check_girdle(gridle, girdle_gia, characteristic_data)
             girdle_point = assign_girdle_value(girdle_gia, characteristic_data)
             final_dict['girdle_score'] = girdle_point
 
-        if pdf_dc['polish'] == "ND" or pdf_dc['polish'] is None:
+        if pdf_dc['polish'] in _UNSET:
             final_dict['polish_score'] = 0
         else:
-            polish_point = check_polish("None", polish_value, characteristic_data)
+            polish_point = _cached_check(check_polish, "None", polish_value)
             final_dict['polish_score'] = polish_point
-        if pdf_dc['symmetry'] == "ND" or pdf_dc["symmetry"] is None:
+        if pdf_dc['symmetry'] in _UNSET:
             final_dict['symmetry_score'] = 0
         else:
-            symmetry_point = check_symmetry('None', symmetry_value, characteristic_data)
+            symmetry_point = _cached_check(check_symmetry, 'None', symmetry_value)
             final_dict['symmetry_score'] = symmetry_point
 
-        if pdf_dc['cut'] == "ND" or pdf_dc['cut'] is None:
+        if pdf_dc['cut'] in _UNSET:
             final_dict['cut_score'] = 0
         else:
-            cut_grade_score = check_cut_grade('None', cut_grade_value, characteristic_data)
+            cut_grade_score = _cached_check(check_cut_grade, 'None', cut_grade_value)
             final_dict['cut_score'] = cut_grade_score
 
         if pdf_dc['fluorescence'] is not None and pdf_dc['color_grade'] is not None:
-            value = check_fluorescence(pdf_dc['fluorescence'], characteristic_data, pdf_dc['color_grade'])
+            value = _cached_check(check_fluorescence, pdf_dc['fluorescence'], Color_Grade=pdf_dc['color_grade'])
             if value is None:
 
                 final_dict['fluorescence_score'] = 0
             else:
                 final_dict['fluorescence_score'] = value
         else:
-            if affiliate_process_data is not None and affiliate_process_data:
-                pdf_dc['fluorescence'] = affiliate_process_data['fluorescence']
-                pdf_dc['color_grade'] = affiliate_process_data['color']
+            if has_aff:
+                pdf_dc['fluorescence'] = aff['fluorescence']
+                pdf_dc['color_grade'] = aff['color']
                 if pdf_dc['fluorescence'] is not None and pdf_dc['color_grade'] is not None:
-                    value = check_fluorescence(pdf_dc['fluorescence'], characteristic_data, pdf_dc['color_grade'])
+                    value = _cached_check(check_fluorescence, pdf_dc['fluorescence'], Color_Grade=pdf_dc['color_grade'])
                     if value is None:
 
                         final_dict['fluorescence_score'] = 0
@@ -1504,34 +1164,32 @@ def fetch_data_round(req_dc, pdf_dc, affiliate_process_data, shape=None):
                 else:
                     final_dict['fluorescence_score'] = 0
                     if pdf_dc['fluorescence'] is None:
-                        pdf_dc["fluorescence"] = 'ND'
+                        pdf_dc["fluorescence"] = _ND
                     if pdf_dc['color_grade'] is not None:
-                        pdf_dc["color_grade"] = 'ND'
+                        pdf_dc["color_grade"] = _ND
             else:
                 final_dict['fluorescence_score'] = 0
                 if pdf_dc['fluorescence'] is None:
-                    pdf_dc["fluorescence"] = 'ND'
+                    pdf_dc["fluorescence"] = _ND
                 if pdf_dc['color_grade'] is not None:
-                    pdf_dc["color_grade"] = 'ND'
+                    pdf_dc["color_grade"] = _ND
 
-        if "key_to_symbol" in pdf_dc and pdf_dc['key_to_symbol'] is not None:
+        if pdf_dc.get('key_to_symbol') is not None:
             symbol_value = check_symbol(pdf_dc['key_to_symbol'], characteristic_data)
 
             final_dict['key_to_symbol_score'] = symbol_value
         else:
             final_dict['key_to_symbol_score'] = 5
 
-        total_marks = sum(list(final_dict.values()))
-        overall_marks = (int(len(final_dict.values()))) * 5
-        percent = (total_marks / overall_marks) * 100
-        final_dict['digisation_score'] = f'{round(percent, 2)}%'
+        percent = sum(final_dict.values()) / (len(final_dict) * 5) * 100
+        final_dict['digisation_score'] = f'{percent:.2f}%'
         logger.debug(
             "Round fetch_data_round completed for shape=%s with digisation_score=%s",
             pdf_dc.get("shape"),
             final_dict['digisation_score'],
         )
         score_dict = score_info_dict(final_dict)
-        score_dict, pdf_dc = dict_np(score_dict, pdf_dc)
+        pdf_dc = _fill_not_applicable(pdf_dc)
 
         return score_dict, pdf_dc_new, pdf_dc
     else:
@@ -1539,22 +1197,16 @@ def fetch_data_round(req_dc, pdf_dc, affiliate_process_data, shape=None):
         return {"Status": "can't find shape from data"}, pdf_dc_new, pdf_dc
 
 
-def dict_np(score_dict, pdf_dc):
-    data_ls = ["cut_score", "crown_angle_score", "pavilion_height_score", "pavilion_angle_score", "measurement_score",
-               "length_width_ratio_score"]
-    for s in data_ls:
-        if s in score_dict and score_dict[s] is None:
-            score_dict[s] = "Not Applicable"
-        elif s not in score_dict:
-            score_dict[s] = "Not Applicable"
-    pdf_ls = ["cut", "crown_angle", "pavilion_height", "pavilion_angle", "crown_height", "star_length",
-              "lower_half_length"]
-    for pdf_d in pdf_ls:
-        if pdf_d in pdf_dc and pdf_dc[pdf_d] is None:
-            pdf_dc[pdf_d] = "Not Applicable"
-        elif pdf_d not in pdf_dc:
-            pdf_dc[pdf_d] = "Not Applicable"
-    return score_dict, pdf_dc
+# pdf fields that are reported as "Not Applicable" instead of left empty
+_NA_PDF_KEYS = ("cut", "crown_angle", "pavilion_height", "pavilion_angle", "crown_height", "star_length",
+                "lower_half_length")
+
+
+def _fill_not_applicable(pdf_dc):
+    for key in _NA_PDF_KEYS:
+        if pdf_dc.get(key) is None:
+            pdf_dc[key] = _NOT_APPLICABLE
+    return pdf_dc
 
 
 class OutputDictionary(TypedDict):
@@ -1575,27 +1227,19 @@ class OutputDictionary(TypedDict):
     crown_angle_score: Optional[int]
 
 
-def score_info_dict(input_dict: dict) -> OutputDictionary:
-    cut_score = input_dict.get('cut_score', None)
-    digisation_score = input_dict.get('digisation_score', None)
-    culet_score = input_dict.get('culet_score', None)
-    depth_score = input_dict.get('depth_score', None)
-    fluorescence_score = input_dict.get('fluorescence_score', None)
-    girdle_score = input_dict.get('girdle_score', None)
-    polish_score = input_dict.get('polish_score', None)
-    symmetry_score = input_dict.get('symmetry_score', None)
-    table_size_score = input_dict.get('table_size_score', None)
-    measurement_score = input_dict.get('measurement_score', None)
-    pavilion_angle_score = input_dict.get('pavilion_angle_score', None)
-    key_to_symbol_score = input_dict.get('key_to_symbol_score', None)
-    pavilion_height_score = input_dict.get('pavilion_height_score', None)
-    length_width_ratio_score = input_dict.get('length_width_ratio_score', None)
-    crown_angle_score = input_dict.get('crown_angle_score', None)
-
-    return {'cut_score': cut_score, 'digisation_score': digisation_score, "pavilion_angle_score": pavilion_angle_score,
-            "pavilion_height_score": pavilion_height_score, "measurement_score": measurement_score,
-            "table_size_score": table_size_score, "symmetry_score": symmetry_score, "polish_score": polish_score,
-            "girdle_score": girdle_score, "fluorescence_score": fluorescence_score, "depth_score": depth_score,
-            "culet_score": culet_score, "key_to_symbol_score": key_to_symbol_score,
-            'length_width_ratio_score': length_width_ratio_score, "crown_angle_score": crown_angle_score}
+# Output order of score_info_dict
+_SCORE_KEY_ORDER = ('cut_score', 'digisation_score', 'pavilion_angle_score', 'pavilion_height_score',
+                    'measurement_score', 'table_size_score', 'symmetry_score', 'polish_score', 'girdle_score',
+                    'fluorescence_score', 'depth_score', 'culet_score', 'key_to_symbol_score',
+                    'length_width_ratio_score', 'crown_angle_score')
+# Scores that are reported as "Not Applicable" instead of None
+_NA_SCORE_KEYS = frozenset(('cut_score', 'crown_angle_score', 'pavilion_height_score', 'pavilion_angle_score',
+                            'measurement_score', 'length_width_ratio_score'))
 
+
+def score_info_dict(input_dict: dict) -> OutputDictionary:
+    score_dict = {key: input_dict.get(key) for key in _SCORE_KEY_ORDER}
+    for key in _NA_SCORE_KEYS:
+        if score_dict[key] is None:
+            score_dict[key] = _NOT_APPLICABLE
+    return score_dict
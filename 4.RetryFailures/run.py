@@ -1,35 +1,50 @@
+import heapq
 import json
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, Iterator, List, Tuple
 import subprocess
 import sys
 
+import ijson
+import orjson
 import psycopg2
 from dotenv import load_dotenv
 
+# This '4.RetryFailures' folder and the project root (its parent), resolved once
+RETRY_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = RETRY_DIR.parent
+
 # --- DATABASE UTILITIES ---
 
 def _load_db_config() -> dict:
     """Load database configuration from .env file or environment."""
-    # Project root is the parent of this '4.RetryFailures' folder
-    project_root = Path(__file__).resolve().parent.parent
-    env_path = project_root / ".env"
+    return dict(_db_config_items())
+
+@lru_cache(maxsize=1)
+def _db_config_items() -> Tuple[Tuple[str, str], ...]:
+    """Read .env once per process; kept as a tuple so the cached value cannot be mutated."""
+    env_path = PROJECT_ROOT / ".env"
     if env_path.exists():
         load_dotenv(env_path)
     else:
         load_dotenv()
 
-    return {
-        "dbname": os.getenv("DB_NAME", "postgres"),
-        "user": os.getenv("DB_USER", "postgres"),
-        "password": os.getenv("DB_PASSWORD", ""),
-        "host": os.getenv("DB_HOST", "localhost"),
-        "port": os.getenv("DB_PORT", "5432"),
-    }
+    return (
+        ("dbname", os.getenv("DB_NAME", "postgres")),
+        ("user", os.getenv("DB_USER", "postgres")),
+        ("password", os.getenv("DB_PASSWORD", "")),
+        ("host", os.getenv("DB_HOST", "localhost")),
+        ("port", os.getenv("DB_PORT", "5432")),
+    )
 
 def fetch_diamond_details(diamond_ids: List[str]) -> List[Dict[str, Any]]:
-    """Fetch diamond_id and certificate_link from DB for the missing IDs."""
+    """Fetch diamond_id and certificate_link from DB for the missing IDs.
+
+    Uses a server-side (named) cursor so rows are streamed in ``itersize``
+    chunks instead of being materialised client-side with ``fetchall()``.
+    """
     if not diamond_ids:
         return []
 
@@ -37,15 +52,15 @@ def fetch_diamond_details(diamond_ids: List[str]) -> List[Dict[str, Any]]:
     conn = None
     try:
         conn = psycopg2.connect(**db_config)
-        cur = conn.cursor()
+        cur = conn.cursor(name="diamond_details_cur")
+        cur.itersize = 10000
         query = """
             SELECT diamond_id, certificate_link
             FROM "Affiliate_app_productinfo"
-            WHERE diamond_id = ANY(%s);
+            WHERE diamond_id = ANY(%s)
         """
         cur.execute(query, (diamond_ids,))
-        rows = cur.fetchall()
-        return [{"diamond_id": str(row[0]), "certificate_link": row[1]} for row in rows]
+        return [{"diamond_id": str(row[0]), "certificate_link": row[1]} for row in cur]
     except Exception as e:
         print(f"❌ Database error: {e}")
         return []
@@ -60,8 +75,8 @@ def load_json(path: Path) -> Any:
     try:
         if not path.exists():
             raise FileNotFoundError(f"File not found: {path}")
-        with path.open("r", encoding="utf-8") as f:
-            return json.load(f)
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError, so the handlers below still apply
+        return orjson.loads(path.read_bytes())
     except FileNotFoundError as e:
         print(f"❌ {e}")
         raise
@@ -72,28 +87,70 @@ def load_json(path: Path) -> Any:
         print(f"❌ Unexpected error reading {path}: {e}")
         raise
 
+def write_json(path: Path, data: Any) -> None:
+    """Write ``data`` to ``path`` as 2-space indented JSON.
+
+    The file is written to a ``.json.tmp`` sibling, fsynced and then moved into
+    place with ``os.replace``, so a crash mid-write never leaves a truncated file.
+    """
+    payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    tmp_path = path.with_suffix(".json.tmp")
+    with tmp_path.open("wb") as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def iter_json_items(path: Path) -> Iterator[Any]:
+    """Iterate over the items of a top-level JSON array.
+
+    Streams one item at a time with ijson, so the whole file never has to sit
+    in memory.
+    """
+    if not path.exists():
+        print(f"❌ File not found: {path}")
+        raise FileNotFoundError(f"File not found: {path}")
+    return _stream_json_items(path)
+
+def _stream_json_items(path: Path) -> Iterator[Any]:
+    with path.open("rb") as f:
+        yield from ijson.items(f, "item", use_float=True)
+
 def build_diamond_records_index(records: List[Dict[str, Any]]) -> Tuple[Dict[str, str], Dict[str, str]]:
     """Build lookup dictionaries: url_to_id and id_to_url."""
-    url_to_id: Dict[str, str] = {}
-    id_to_url: Dict[str, str] = {}
-    for rec in records:
-        if isinstance(rec, dict):
-            d_id = rec.get("diamond_id")
-            url = rec.get("certificate_link")
-            if d_id and url:
-                url_to_id[str(url)] = str(d_id)
-                id_to_url[str(d_id)] = str(url)
+    # IDs are interned so the same ID read from InsertToDb.json shares one object
+    pairs = [
+        (sys.intern(str(rec["diamond_id"])), str(rec["certificate_link"]))
+        for rec in records
+        if isinstance(rec, dict) and rec.get("diamond_id") and rec.get("certificate_link")
+    ]
+    id_to_url: Dict[str, str] = dict(pairs)
+    url_to_id: Dict[str, str] = {url: d_id for d_id, url in pairs}
     return url_to_id, id_to_url
 
+def sorted_diff(a: List[str], b: List[str]) -> List[str]:
+    """Return the items of sorted list ``a`` that are not in sorted list ``b``.
+
+    Walks both lists once instead of hashing them into sets; the result stays sorted.
+    """
+    missing: List[str] = []
+    j, n = 0, len(b)
+    for item in a:
+        while j < n and b[j] < item:
+            j += 1
+        if j == n or b[j] != item:
+            missing.append(item)
+    return missing
+
 # --- MAIN LOGIC ---
 
 def run_integrity_and_recovery() -> List[str]:
     # 1. Setup Paths (relative to Digitization root)
-    project_root = Path(__file__).resolve().parent.parent
+    project_root = PROJECT_ROOT
     diamond_records_path = project_root / "1.FetchFromDB" / "diamond_records.json"
     insert_to_db_path = project_root / "3.ScoringAndDBOps" / "InsertToDb.json"
     # Write the retry/missing file in this folder (4.RetryFailures), not the parent
-    missing_output_path = Path(__file__).resolve().parent / "failed_diamonds.json"
+    missing_output_path = RETRY_DIR / "failed_diamonds.json"
 
     # Ensure we start with a clean file each run
     try:
@@ -110,54 +167,70 @@ def run_integrity_and_recovery() -> List[str]:
     # 2. Load Data with error handling
     try:
         diamond_records = load_json(diamond_records_path)
-        insert_records = load_json(insert_to_db_path)
+        insert_records = iter_json_items(insert_to_db_path)
     except Exception:
         print("❌ Aborting: failed to load one or more required JSON files.")
         return []
     
     url_to_id, id_to_url = build_diamond_records_index(diamond_records)
-    truth_ids = set(id_to_url.keys())
 
     # 3. Analyze Consistency
     ok, missing_id_count, id_mismatch, url_mismatch = 0, 0, 0, 0
-    mismatches = []
-
-    for idx, rec in enumerate(insert_records):
-        d_id = rec.get("diamond_id")
-        img = rec.get("image_url") or rec.get("certificate_link")
-
-        if not d_id:
-            missing_id_count += 1
-            continue
-
-        d_id_str = str(d_id)
-        img_str = str(img) if img else None
-
-        if d_id_str and img_str:
-            truth_id = url_to_id.get(img_str)
-            truth_url = id_to_url.get(d_id_str)
-
-            is_dirty = False
-            if truth_id and truth_id != d_id_str:
-                id_mismatch += 1
-                is_dirty = True
-            if truth_url and truth_url != img_str:
-                url_mismatch += 1
-                is_dirty = True
+    # Collected in the same pass so InsertToDb.json is only read once
+    insert_ids: List[str] = []
+    total = 0
+    # Bound once; this loop runs over every InsertToDb.json record. It stays a plain
+    # streamed loop rather than a DataFrame join: the records are never materialised,
+    # and a batch is at most 1000 diamonds (1.FetchFromDB LIMIT).
+    lookup_truth_id = url_to_id.get
+    lookup_truth_url = id_to_url.get
+    add_insert_id = insert_ids.append
+    intern = sys.intern
+    # Only the first 10 mismatches are reported, printed as they are found
+    printed_mismatches = 0
+
+    try:
+        for idx, rec in enumerate(insert_records):
+            total += 1
+            d_id = rec.get("diamond_id")
+            img = rec.get("image_url") or rec.get("certificate_link")
+
+            if not d_id:
+                missing_id_count += 1
+                continue
+
+            d_id_str = intern(str(d_id))
+            add_insert_id(d_id_str)
+            img_str = str(img) if img else None
+
+            if d_id_str and img_str:
+                truth_id = lookup_truth_id(img_str)
+                truth_url = lookup_truth_url(d_id_str)
+
+                is_dirty = False
+                if truth_id and truth_id != d_id_str:
+                    id_mismatch += 1
+                    is_dirty = True
+                if truth_url and truth_url != img_str:
+                    url_mismatch += 1
+                    is_dirty = True
             
-            if not is_dirty:
-                ok += 1
-            elif len(mismatches) < 10:
-                mismatches.append(f"Index {idx}: ID {d_id_str} does not match expected URL data.")
+                if not is_dirty:
+                    ok += 1
+                elif printed_mismatches < 10:
+                    print(f" - Index {idx}: ID {d_id_str} does not match expected URL data.")
+                    printed_mismatches += 1
+    except ijson.JSONError as e:
+        print(f"❌ Failed to parse JSON from {insert_to_db_path}: {e}")
+        print("❌ Aborting: failed to load one or more required JSON files.")
+        return []
 
     # 4. Print Summary
-    print(f"Processed: {len(insert_records)} | Consistent: {ok} | Mismatches: {id_mismatch + url_mismatch}")
-    if mismatches:
-        for m in mismatches: print(f" - {m}")
+    print(f"Processed: {total} | Consistent: {ok} | Mismatches: {id_mismatch + url_mismatch}")
 
     # 5. Identify Missing
-    insert_ids = {str(r.get("diamond_id")) for r in insert_records if r.get("diamond_id")}
-    missing_ids = sorted(list(truth_ids - insert_ids))
+    # A batch is at most 1000 IDs, so a set difference is enough; only the result is sorted
+    missing_ids = sorted(set(id_to_url) - set(insert_ids))
     
     print(f"\n--- Step 2: Recovery from diamond_records.json (no DB) ---")
     print(f"Missing Diamonds detected: {len(missing_ids)}")
@@ -166,19 +239,12 @@ def run_integrity_and_recovery() -> List[str]:
         print("Populating missing records from diamond_records.json...")
         # We already have id_to_url from build_diamond_records_index, so we can
         # reconstruct the same structure as diamond_records.json without hitting DB.
-        enriched_missing_records: List[Dict[str, Any]] = []
-        for d_id in missing_ids:
-            url = id_to_url.get(d_id)
-            if url:
-                enriched_missing_records.append(
-                    {
-                        "diamond_id": d_id,
-                        "certificate_link": url,
-                    }
-                )
-
-        with missing_output_path.open("w", encoding="utf-8") as f:
-            json.dump(enriched_missing_records, f, indent=2)
+        # Every missing ID came from id_to_url, so its (non-empty) URL is always there.
+        enriched_missing_records: List[Dict[str, Any]] = [
+            {"diamond_id": d_id, "certificate_link": id_to_url[d_id]} for d_id in missing_ids
+        ]
+
+        write_json(missing_output_path, enriched_missing_records)
 
         print(
             f"✅ Success! Saved {len(enriched_missing_records)} enriched records "
@@ -198,15 +264,20 @@ def run_downstream_steps(project_root: Path) -> None:
       2. python 2..CallOpenAI/scripts/submit_batch_concurrent.py
       3. python 2..CallOpenAI/scripts/check_batch_concurrent.py
       4. python 3.ScoringAndDBOps/run.py
+
+    The steps stay strictly sequential: each one consumes a file the previous one
+    writes (batch manifest -> batch_job_ids.json -> batch results), and submit
+    already waits on the OpenAI batches itself, so there is nothing to overlap.
+    Like cronjob.run_command, the steps run under the current interpreter.
     """
     commands = [
         # Note: create_batch_concurrent resolves paths relative to its own
         # project root (the 2..CallOpenAI folder), so we pass a path that is
         # correct from there: "../4.RetryFailures/failed_diamonds.json".
-        ["python", "2..CallOpenAI/scripts/create_batch_concurrent.py", "--input-file", "../4.RetryFailures/failed_diamonds.json"],
-        ["python", "2..CallOpenAI/scripts/submit_batch_concurrent.py"],
-        ["python", "2..CallOpenAI/scripts/check_batch_concurrent.py"],
-        ["python", "3.ScoringAndDBOps/run.py"],
+        [sys.executable, "2..CallOpenAI/scripts/create_batch_concurrent.py", "--input-file", "../4.RetryFailures/failed_diamonds.json"],
+        [sys.executable, "2..CallOpenAI/scripts/submit_batch_concurrent.py"],
+        [sys.executable, "2..CallOpenAI/scripts/check_batch_concurrent.py"],
+        [sys.executable, "3.ScoringAndDBOps/run.py"],
     ]
 
     for idx, cmd in enumerate(commands, start=1):
@@ -229,26 +300,26 @@ def run_downstream_steps(project_root: Path) -> None:
             print(f"✅ Step {idx} completed successfully.")
 
 
-def write_final_failures(project_root: Path) -> None:
+def write_final_failures(project_root: Path, missing_ids: List[str]) -> None:
     """
-    After the second pass (retry pipeline), re-check for any diamonds that are still
-    missing from InsertToDb.json and write their IDs to final_failure.json.
+    After the second pass (retry pipeline), re-check which of the diamonds that were
+    missing before the retry are still missing and write their IDs to final_failure.json.
+
+    The retry scoring run writes the IDs it committed to inserted_this_run.json, so
+    only that small file is read instead of re-loading diamond_records.json and
+    InsertToDb.json.
     """
-    diamond_records_path = project_root / "1.FetchFromDB" / "diamond_records.json"
-    insert_to_db_path = project_root / "3.ScoringAndDBOps" / "InsertToDb.json"
+    inserted_path = project_root / "3.ScoringAndDBOps" / "inserted_this_run.json"
     final_failure_path = project_root / "4.RetryFailures" / "final_failure.json"
 
     try:
-        diamond_records = load_json(diamond_records_path)
-        insert_records = load_json(insert_to_db_path)
+        inserted_ids = sorted(sys.intern(str(d_id)) for d_id in load_json(inserted_path))
     except Exception:
         print("⚠ Skipping final failure check: could not load required JSON files.")
         return
 
-    _, id_to_url = build_diamond_records_index(diamond_records)
-    truth_ids = set(id_to_url.keys())
-    insert_ids = {str(r.get("diamond_id")) for r in insert_records if r.get("diamond_id")}
-    still_missing = sorted(list(truth_ids - insert_ids))
+    # missing_ids comes back sorted from run_integrity_and_recovery
+    still_missing = sorted_diff(missing_ids, inserted_ids)
 
     try:
         # If file exists, load existing failures and merge; otherwise start fresh.
@@ -262,10 +333,13 @@ def write_final_failures(project_root: Path) -> None:
                 # If the existing file is corrupt, we just overwrite with the new set.
                 existing = []
 
-        combined = sorted(set(existing).union(still_missing), key=str)
+        # still_missing is already sorted, so merge the two sorted runs and drop repeats
+        combined: List[str] = []
+        for d_id in heapq.merge(sorted(existing), still_missing):
+            if not combined or combined[-1] != d_id:
+                combined.append(d_id)
 
-        with final_failure_path.open("w", encoding="utf-8") as f:
-            json.dump(combined, f, indent=2)
+        write_json(final_failure_path, combined)
         print(
             f"✅ Final failure check complete. Remaining missing diamonds: "
             f"{len(still_missing)} (total unique in file: {len(combined)}) "
@@ -286,8 +360,8 @@ if __name__ == "__main__":
         sys.exit(0)
 
     # Otherwise, run the downstream OpenAI + scoring pipeline
-    project_root = Path(__file__).resolve().parent.parent
+    project_root = PROJECT_ROOT
     run_downstream_steps(project_root)
 
     # After the retry pipeline, perform a final failure check
-    write_final_failures(project_root)
+    write_final_failures(project_root, missing_ids)
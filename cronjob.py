@@ -1,4 +1,3 @@
-import json
 import logging
 import subprocess
 import sys
@@ -13,6 +12,12 @@ def run_command(description: str, script_path: Path, project_root: Path) -> None
     """
     Run a Python script using the current interpreter and wait until it finishes.
     Raises CalledProcessError if the command fails.
+
+    Each stage deliberately gets its own process rather than being imported and
+    called in-process: 3.ScoringAndDBOps/run.py does its work at module level,
+    the OpenAI scripts parse sys.argv, call sys.exit and prepend their own folder
+    to sys.path, and 3.ScoringAndDBOps configures logging at import. The spawn
+    cost is also small next to the OpenAI batch wait in every iteration.
     """
     full_path = project_root / script_path
 
@@ -41,6 +46,15 @@ def run_command(description: str, script_path: Path, project_root: Path) -> None
         raise subprocess.CalledProcessError(result.returncode, result.args)
 
 
+def _json_array_has_items(head: bytes) -> bool:
+    """Return True if ``head`` starts a JSON array with at least one element."""
+    stripped = head.lstrip(b" \t\r\n")
+    if not stripped.startswith(b"["):
+        return False
+    rest = stripped[1:].lstrip(b" \t\r\n")
+    return bool(rest) and not rest.startswith(b"]")
+
+
 def fetch_batch_has_work(project_root: Path) -> bool:
     """
     Check whether the last fetch run produced any diamonds.
@@ -55,10 +69,12 @@ def fetch_batch_has_work(project_root: Path) -> bool:
         return False
 
     try:
-        with records_path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-        if isinstance(data, list) and len(data) > 0:
-            msg = f"diamond_records.json contains {len(data)} records."
+        # Only the start of the array is needed to tell whether it is empty,
+        # so peek at the head instead of parsing the whole file.
+        with records_path.open("rb") as f:
+            head = f.read(4096)
+        if _json_array_has_items(head):
+            msg = "diamond_records.json contains records."
             print(msg)
             logger.info(msg)
             return True